@@ -96,6 +96,9 @@ class Settings(BaseSettings):
     MAX_BATCH_SIZE: int = Field(default=1000, description="Maximum batch operation size")
     ENABLE_UNDO: bool = Field(default=True, description="Enable undo functionality")
     MAX_UNDO_HISTORY: int = Field(default=50, description="Maximum undo history entries")
+    MAX_UNDO_STACK_MB: int = Field(default=100, description="Max total on-disk size of the snapshots tracked for undo")
+    PARALLEL_SEARCH: bool = Field(default=True, description="Read files concurrently during content search")
+    SEARCH_CONCURRENCY: int = Field(default=16, description="Max files read at once by content search")
 
     # Security Settings 
     ENABLE_SECURITY_VALIDATION: bool = Field(default=True, description="Enable path security validation")
@@ -111,6 +114,8 @@ class Settings(BaseSettings):
     ENABLE_AUDIT_LOG: bool = Field(default=True, description="Enable audit logging")
     AUDIT_RETENTION_DAYS: int = Field(default=90, description="Audit log retention period")
     AUDIT_INCLUDE_READ_OPS: bool = Field(default=False, description="Log read-only operations")
+    AUDIT_BATCH_SIZE: int = Field(default=256, description="Max queued audit entries written per flush")
+    AUDIT_BATCH_INTERVAL_MS: int = Field(default=50, description="Max time queued audit entries wait before flush")
     
     # Security Limits 
     MAX_PATH_DEPTH: int = Field(default=10, description="Maximum directory recursion depth")
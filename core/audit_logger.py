@@ -1,5 +1,8 @@
+import asyncio
 import json
 import sqlite3
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -58,6 +61,13 @@ class AuditLogger:
         today = datetime.utcnow().strftime("%Y-%m-%d")
         self.log_file = self.audit_dir / f"audit_{today}.jsonl"
         
+        # Serializes file/DB writes between the event loop and the flush thread
+        self._write_lock = threading.Lock()
+        
+        # Background batch writer (started lazily on first queued entry)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        
         self.logger.info(
             "AuditLogger initialized",
             extra={
@@ -157,9 +167,36 @@ class AuditLogger:
         Returns:
             Audit log ID
         """
-        audit_id = str(uuid4())
-        timestamp = datetime.utcnow().isoformat()
+        entry = self._build_entry(
+            operation_type, status, details, snapshot_id, error, user_id, risk_level, paths
+        )
+        # Durable before returning, but the disk write runs off the event loop
+        await asyncio.to_thread(self.log_batch, [entry])
+        
+        self.logger.info(
+            "audit_logged",
+            extra={
+                "audit_id": entry["audit_id"],
+                "operation": operation_type,
+                "status": status,
+                "user_id": user_id
+            }
+        )
         
+        return entry["audit_id"]
+    
+    def _build_entry(
+        self,
+        operation_type: str,
+        status: str,
+        details: Dict[str, Any],
+        snapshot_id: str = None,
+        error: str = None,
+        user_id: str = "default_user",
+        risk_level: str = "unknown",
+        paths: List[str] = None
+    ) -> Dict[str, Any]:
+        """Build a JSONL-shaped audit entry (timestamped at call time)"""
         # Prepare paths
         if paths is None:
             paths = details.get("paths", [])
@@ -168,17 +205,9 @@ class AuditLogger:
         else:
             paths = [str(p) for p in paths]
         
-        # Calculate file count and size from details
-        file_count = details.get("file_count", len(paths))
-        total_size = details.get("total_size_bytes", 0)
-        
-        # Determine success from status
-        success = status.lower() in ["success", "completed"]
-        
-        # Legacy JSONL entry (preserved)
-        jsonl_entry = {
-            "audit_id": audit_id,
-            "timestamp": timestamp,
+        return {
+            "audit_id": str(uuid4()),
+            "timestamp": datetime.utcnow().isoformat(),
             "operation_type": operation_type,
             "status": status,
             "details": details,
@@ -189,58 +218,155 @@ class AuditLogger:
             "risk_level": risk_level,
             "paths": paths
         }
+    
+    def log_batch(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Write several audit entries at once
+        
+        One JSONL append and one SQLite transaction for the whole batch.
+        
+        Args:
+            entries: Entries built by _build_entry
+            
+        Returns:
+            Number of entries written
+        """
+        if not entries:
+            return 0
+        
+        with self._write_lock:
+            self._write_entries(entries)
         
+        return len(entries)
+    
+    def _write_entries(self, entries: List[Dict[str, Any]]):
+        """Append entries to JSONL and SQLite (caller holds _write_lock)"""
         # Write to JSONL file (legacy compatibility)
         try:
             with open(self.log_file, 'a') as f:
-                f.write(json.dumps(jsonl_entry) + '\n')
+                f.write("".join(json.dumps(entry) + '\n' for entry in entries))
         except Exception as e:
             self.logger.error(f"Failed to write JSONL audit log: {e}")
         
+        rows = []
+        for entry in entries:
+            details = entry["details"]
+            paths = entry["paths"]
+            rows.append((
+                entry["audit_id"],
+                entry["timestamp"],
+                entry["user_id"],
+                entry["operation_type"],  # operation column
+                entry["operation_type"],  # operation_type column for compatibility
+                entry["risk_level"],
+                entry["status"],
+                json.dumps(paths),
+                details.get("file_count", len(paths)),
+                details.get("total_size_bytes", 0),
+                entry["status"].lower() in ["success", "completed"],
+                json.dumps(details),
+                entry["snapshot_id"],
+                entry["error"]
+            ))
+        
         # Write to SQLite database (Week 2)
         try:
             conn = sqlite3.connect(str(self.db_path))
             cursor = conn.cursor()
             
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT INTO audit_log 
                 (audit_id, timestamp, user_id, operation, operation_type, 
                  risk_level, status, paths, file_count, total_size, 
                  success, details, snapshot_id, error)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                audit_id,
-                timestamp,
-                user_id,
-                operation_type,  # operation column
-                operation_type,  # operation_type column for compatibility
-                risk_level,
-                status,
-                json.dumps(paths),
-                file_count,
-                total_size,
-                success,
-                json.dumps(details),
-                snapshot_id,
-                error
-            ))
+            """, rows)
             
             conn.commit()
             conn.close()
         except Exception as e:
             self.logger.error(f"Failed to write database audit log: {e}", exc_info=True)
+    
+    # ==================== BUFFERED LOGGING ====================
+    
+    def log_operation_nowait(
+        self,
+        operation_type: str,
+        status: str,
+        details: Dict[str, Any],
+        snapshot_id: str = None,
+        error: str = None,
+        user_id: str = "default_user",
+        risk_level: str = "unknown",
+        paths: List[str] = None
+    ) -> str:
+        """
+        Queue an operation for the background audit writer
         
-        self.logger.info(
-            "audit_logged",
-            extra={
-                "audit_id": audit_id,
-                "operation": operation_type,
-                "status": status,
-                "user_id": user_id
-            }
+        Same arguments as log_operation, but returns immediately. Entries are
+        written in batches of up to AUDIT_BATCH_SIZE, at most
+        AUDIT_BATCH_INTERVAL_MS after they were queued. Falls back to a direct
+        write when no event loop is running.
+        
+        Returns:
+            Audit log ID
+        """
+        entry = self._build_entry(
+            operation_type, status, details, snapshot_id, error, user_id, risk_level, paths
         )
         
-        return audit_id
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.log_batch([entry])
+            return entry["audit_id"]
+        
+        self._ensure_worker()
+        self._queue.put_nowait(entry)
+        return entry["audit_id"]
+    
+    def _ensure_worker(self):
+        """Start (or restart) the background flush task on the running loop"""
+        if self._worker is not None and not self._worker.done():
+            return
+        
+        # Carry over anything a previous (dead) worker left behind
+        leftover = []
+        while self._queue is not None and not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+        
+        self._queue = asyncio.Queue()
+        for entry in leftover:
+            self._queue.put_nowait(entry)
+        self._worker = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        """Drain the queue in batches and write them off the event loop"""
+        batch_size = max(1, getattr(settings, 'AUDIT_BATCH_SIZE', 256))
+        interval = getattr(settings, 'AUDIT_BATCH_INTERVAL_MS', 50) / 1000
+        
+        while True:
+            batch = [await self._queue.get()]
+            if interval > 0:
+                await asyncio.sleep(interval)
+            while len(batch) < batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                await asyncio.to_thread(self.log_batch, batch)
+                self.logger.debug("audit_batch_flushed", extra={"count": len(batch)})
+            except Exception as e:
+                self.logger.error(f"Failed to flush audit batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def flush(self):
+        """Wait until every queued audit entry has been written"""
+        if self._queue is None:
+            return
+        self._ensure_worker()
+        await self._queue.join()
     
     # ==================== LEGACY METHOD (Preserved) ====================
     
@@ -249,6 +375,14 @@ class AuditLogger:
         Get recent operations from audit log (Legacy method - enhanced)
         Now reads from SQLite if available, falls back to JSONL
         """
+        # Make sure queued entries are visible to the query
+        await self.flush()
+        
+        # Query and file reads block, keep them off the event loop
+        return await asyncio.to_thread(self._read_recent_operations, limit)
+    
+    def _read_recent_operations(self, limit: int) -> List[Dict]:
+        """Read the newest `limit` operations, newest first"""
         try:
             # Try SQLite first (Week 2)
             conn = sqlite3.connect(str(self.db_path))
@@ -272,16 +406,17 @@ class AuditLogger:
         # Fallback to JSONL (legacy)
         operations = []
         
-        if not self.log_file.exists():
+        if not self.log_file.exists() or limit <= 0:
             return operations
         
         try:
-            # Read last N lines
+            # Stream the file keeping only the last N lines, rather than
+            # reading the whole day's log into memory
             with open(self.log_file, 'r') as f:
-                lines = f.readlines()
+                lines = deque(f, maxlen=limit)
             
             # Parse and return most recent
-            for line in reversed(lines[-limit:]):
+            for line in reversed(lines):
                 try:
                     operations.append(json.loads(line))
                 except json.JSONDecodeError:
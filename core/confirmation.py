@@ -2,7 +2,9 @@ from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
+from uuid import uuid4
 import asyncio
+import hashlib
 
 from core.risk_assesment import risk_assessor, RiskLevel, RiskAssessment
 from core.audit_logger import audit_logger
@@ -64,7 +66,6 @@ class ConfirmationManager:
         Returns:
             Confirmation message for user
         """
-        from uuid import uuid4
         operation_id = str(uuid4())
         
         self.pending_operations[operation_id] = {
@@ -457,7 +458,6 @@ class ConfirmationManager:
     
     def _generate_operation_id(self, operation: str) -> str:
         """Generate unique operation ID"""
-        import hashlib
         timestamp = datetime.utcnow().isoformat()
         hash_input = f"{operation}_{timestamp}".encode()
         return hashlib.md5(hash_input).hexdigest()[:12]
@@ -475,4 +475,8 @@ class ConfirmationManager:
                 )
                 for level in RiskLevel
             }
-        }
\ No newline at end of file
+        }
+
+
+# Global instance
+confirmation_manager = ConfirmationManager()
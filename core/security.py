@@ -3,6 +3,7 @@ from typing import List, Tuple, Optional
 import os
 
 from config.security_config import security_config
+from config.policies import FORBIDDEN_PATHS
 from core.exceptions import PathSecurityError, ValidationError
 from utils.logger import get_logger
 
@@ -88,6 +89,22 @@ class PathValidator:
                     path=str(resolved)
                 )
             
+            # Check for hidden directories along the path
+            if self._has_hidden_parent(resolved):
+                raise PathSecurityError(
+                    f"Path '{resolved}' is inside a hidden directory",
+                    path=str(resolved)
+                )
+            
+            # Check the legacy system prefixes (config.policies), which also
+            # cover /tmp and /root on Linux
+            if self._has_legacy_forbidden_prefix(resolved):
+                raise PathSecurityError(
+                    f"Cannot access '{resolved}' - it's a protected system directory. "
+                    f"Try Downloads, Desktop, or Documents instead.",
+                    path=str(resolved)
+                )
+            
             # Check file extension for delete operations
             if operation == "delete" and resolved.is_file():
                 if resolved.suffix.lower() in self.forbidden_extensions:
@@ -208,6 +225,18 @@ class PathValidator:
         
         return False
     
+    def _has_hidden_parent(self, path: Path) -> bool:
+        """Check if any parent directory is hidden (dot-prefixed)"""
+        return any(
+            part.startswith('.') and part not in ['.', '..']
+            for part in path.parts[:-1]
+        )
+    
+    def _has_legacy_forbidden_prefix(self, path: Path) -> bool:
+        """Check the resolved path against config.policies.FORBIDDEN_PATHS, like is_path_safe"""
+        path_str = str(path)
+        return any(path_str.startswith(forbidden) for forbidden in FORBIDDEN_PATHS)
+    
     def get_safe_operation_summary(
         self,
         paths: List[Path],
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import shutil
 from pathlib import Path
@@ -5,10 +6,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from uuid import uuid4
-from utils.logger import get_logger
+from utils.logger import get_structlog_logger
+from utils.cache import invalidate_path_caches
 from config.settings import settings
 
-logger = get_logger(__name__)
+logger = get_structlog_logger(__name__)
 
 @dataclass
 class Snapshot:
@@ -19,6 +21,9 @@ class Snapshot:
     folders_created: List[str]
     metadata: Dict
     created_at: str
+    # Bytes the serialized snapshot takes on disk, set by create_snapshot
+    # (not stored in the file; 0 on loaded snapshots)
+    size_bytes: int = 0
     
     @property
     def is_expired(self) -> bool:
@@ -64,10 +69,11 @@ class SnapshotManager:
             created_at=datetime.utcnow().isoformat()
         )
         
-        # Save to disk
+        # Save to disk (off the event loop - large organizes make big snapshots)
         snapshot_path = self.snapshots_dir / f"{snapshot_id}.json"
-        with open(snapshot_path, 'w') as f:
-            json.dump(asdict(snapshot), f, indent=2)
+        snapshot.size_bytes = await asyncio.to_thread(
+            self._write_snapshot, snapshot_path, snapshot
+        )
         
         self.logger.info(
             "snapshot_created",
@@ -78,6 +84,15 @@ class SnapshotManager:
         
         return snapshot
     
+    def _write_snapshot(self, snapshot_path: Path, snapshot: Snapshot) -> int:
+        """Serialize a snapshot to disk, returning the bytes written"""
+        data = asdict(snapshot)
+        del data["size_bytes"]
+        encoded = json.dumps(data, indent=2).encode("utf-8")
+        with open(snapshot_path, 'wb') as f:
+            f.write(encoded)
+        return len(encoded)
+    
     async def load_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
         """Load a snapshot by ID"""
         snapshot_path = self.snapshots_dir / f"{snapshot_id}.json"
@@ -86,11 +101,15 @@ class SnapshotManager:
             self.logger.warning("snapshot_not_found", snapshot_id=snapshot_id)
             return None
         
-        with open(snapshot_path, 'r') as f:
-            data = json.load(f)
-        
+        data = await asyncio.to_thread(self._read_snapshot, snapshot_path)
+        data.pop("size_bytes", None)
         return Snapshot(**data)
     
+    def _read_snapshot(self, snapshot_path: Path) -> Dict:
+        """Read a snapshot file from disk"""
+        with open(snapshot_path, 'r') as f:
+            return json.load(f)
+    
     async def rollback(self, snapshot_id: str) -> Dict:
         """
         Rollback using a snapshot
@@ -150,6 +169,9 @@ class SnapshotManager:
             except Exception as e:
                 self.logger.warning("folder_removal_failed", error=str(e))
         
+        # Paths changed: cached validations and scans may be stale
+        invalidate_path_caches()
+        
         self.logger.info(
             "rollback_complete",
             snapshot_id=snapshot_id,
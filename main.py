@@ -17,6 +17,7 @@ from livekit.plugins import openai, noise_cancellation, deepgram, silero
 # Core components
 from core.confirmation import ConfirmationManager
 from core.memory_manager import MemoryManager 
+from core.audit_logger import audit_logger
 from config.prompts import SYSTEM_PROMPT
 from config.greetings import get_greeting
 from utils.logger import get_logger
@@ -178,6 +179,9 @@ server = AgentServer()
 async def file_organizer_agent(ctx: agents.JobContext):
     logger.info("RTC session started", room=ctx.room.name)
 
+    # Write out any queued audit entries before the job exits
+    ctx.add_shutdown_callback(audit_logger.flush)
+
     session = AgentSession()
     chat_ctx = ChatContext()
 
@@ -1,5 +1,26 @@
 from typing import Dict, List, Optional, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, is_dataclass
+
+# Types passed through to_dict unchanged; checked by exact type first so the
+# common case skips the isinstance chain
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _sanitize(value):
+    """Copy a result value into plain JSON types, stringifying anything else"""
+    kind = type(value)
+    if kind in _SCALAR_TYPES:
+        return value
+    if isinstance(value, dict):
+        return {k: _sanitize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_sanitize(v) for v in value]
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _sanitize(getattr(value, f.name)) for f in fields(value)}
+    return str(value)  # fallback safety
+
 
 @dataclass
 class ToolResult:
@@ -14,14 +35,22 @@ class ToolResult:
     
     def to_dict(self) -> Dict:
         """Convert to JSON-serializable dictionary"""
-        def sanitize(value):
-            if isinstance(value, dict):
-                return {k: sanitize(v) for k, v in value.items()}
-            if isinstance(value, list):
-                return [sanitize(v) for v in value]
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                return value
-            return str(value)  # fallback safety
+        # A single pass over the fields: asdict() would deep-copy data only
+        # for sanitize to rebuild it again, and it cannot rebuild dict
+        # subclasses such as defaultdict
+        return {
+            k: _sanitize(v) for k, v in vars(self).items() if v is not None
+        }
 
-        raw = asdict(self)
-        return {k: sanitize(v) for k, v in raw.items() if v is not None}
+    @classmethod
+    def error_dict(cls, error: str, *, prefix: str = "") -> Dict:
+        """
+        Failure result as a dict, same shape as
+        ToolResult(success=False, error=...).to_dict() without the
+        dataclass round-trip
+        """
+        return {
+            "success": False,
+            "error": f"{prefix}{error}",
+            "requires_confirmation": False,
+        }
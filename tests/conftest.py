@@ -0,0 +1,45 @@
+"""
+Shared fixtures for the tool tests
+"""
+import pytest
+
+import config.policies
+import core.security
+from core.audit_logger import audit_logger
+from core.security import path_validator
+from tools import mutate_tools, organize_tools, utility_tools
+from utils.cache import invalidate_path_caches
+
+
+@pytest.fixture
+async def sandbox(tmp_path, monkeypatch):
+    """
+    A folder the tools may work in, with snapshots and audit logs kept
+    under tmp_path and a fresh undo stack
+    """
+    root = tmp_path / "sandbox"
+    root.mkdir()
+
+    # The default policy only allows folders under home, and its legacy
+    # prefixes block /tmp outright
+    monkeypatch.setattr(path_validator, "allowed_paths", [root])
+    monkeypatch.setattr(core.security, "FORBIDDEN_PATHS", [])
+    monkeypatch.setattr(config.policies, "FORBIDDEN_PATHS", [])
+
+    snapshots_dir = tmp_path / "snapshots"
+    snapshots_dir.mkdir()
+    for module in (mutate_tools, organize_tools, utility_tools):
+        monkeypatch.setattr(module.snapshot_mgr, "snapshots_dir", snapshots_dir)
+    monkeypatch.setattr(utility_tools, "_state", utility_tools.UtilityState())
+
+    # Each test runs on its own event loop, so it gets its own audit writer
+    monkeypatch.setattr(audit_logger, "db_path", tmp_path / "audit.db")
+    monkeypatch.setattr(audit_logger, "log_file", tmp_path / "audit.jsonl")
+    monkeypatch.setattr(audit_logger, "_queue", None)
+    monkeypatch.setattr(audit_logger, "_worker", None)
+    audit_logger._init_database()
+
+    invalidate_path_caches()
+    yield root
+    await audit_logger.flush()
+    invalidate_path_caches()
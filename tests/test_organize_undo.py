@@ -0,0 +1,63 @@
+"""
+Test suite for organizing a folder and undoing it
+"""
+from types import SimpleNamespace
+
+from tools.organize_tools import execute_organize
+from tools.utility_tools import undo_last_action_tool
+
+
+context = SimpleNamespace(user_id="test_user")
+
+
+def tree(root):
+    """Relative paths of everything below root"""
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*"))
+
+
+class TestOrganizeUndo:
+    """Test that undo restores a folder organized by execute_organize"""
+
+    async def test_undo_restores_original_layout(self, sandbox):
+        """Test organize moves files into groups and undo moves them back"""
+        for name in ["report.pdf", "notes.txt", "photo.jpg", "song.mp3", "script.py"]:
+            (sandbox / name).write_text(name, encoding="utf-8")
+        (sandbox / "projects").mkdir()
+        (sandbox / "projects" / "todo.txt").write_text("todo", encoding="utf-8")
+        before = tree(sandbox)
+
+        result = await execute_organize(context, str(sandbox), "by_extension")
+        assert result["success"] is True
+        assert result["data"]["moved"] > 0
+        assert tree(sandbox) != before
+
+        result = await undo_last_action_tool(context)
+        assert result["success"] is True
+        assert tree(sandbox) == before
+
+        # The organize was the only entry on the undo stack
+        result = await undo_last_action_tool(context)
+        assert result["success"] is False
+
+    async def test_undo_after_two_organizes(self, sandbox):
+        """Test each organize gets its own undo step"""
+        for name in ["a.pdf", "b.txt", "c.jpg"]:
+            (sandbox / name).write_text(name, encoding="utf-8")
+        before = tree(sandbox)
+
+        result = await execute_organize(context, str(sandbox), "by_extension")
+        assert result["success"] is True
+        assert tree(sandbox) != before
+
+        (sandbox / "d.mp3").write_text("d", encoding="utf-8")
+        after_write = tree(sandbox)
+        result = await execute_organize(context, str(sandbox), "by_extension")
+        assert result["success"] is True
+
+        result = await undo_last_action_tool(context)
+        assert result["success"] is True
+        assert tree(sandbox) == after_write
+
+        result = await undo_last_action_tool(context)
+        assert result["success"] is True
+        assert tree(sandbox) == sorted(set(before) | {"d.mp3"})
@@ -0,0 +1,132 @@
+"""
+Test suite for the read tools: content search and path/scan caching
+"""
+import os
+from types import SimpleNamespace
+
+from tools.create_tools import create_file_tool
+from tools.read_tools import (
+    read_file_content_tool,
+    scan_folder_tool,
+    search_file_contents_tool,
+)
+
+
+context = SimpleNamespace(user_id="test_user")
+
+
+def baseline_search(root, query, case_sensitive=False):
+    """The original search: rglob every file and look for the query in its text"""
+    needle = query if case_sensitive else query.lower()
+    matches = []
+    for file in root.rglob("*"):
+        if not file.is_file():
+            continue
+        text = file.read_text(encoding="utf-8", errors="ignore")
+        haystack = text if case_sensitive else text.lower()
+        if needle in haystack:
+            matches.append(str(file))
+    return sorted(matches)
+
+
+def scanned_names(result):
+    """Every file or folder name in a scan_folder_tool result"""
+    return {
+        item["name"]
+        for items in result["data"]["files_by_category"].values()
+        for item in items
+    }
+
+
+class TestSearchFileContents:
+    """Test search_file_contents_tool against the original rglob search"""
+
+    def _make_tree(self, root):
+        files = {
+            "notes.txt": "Budget review on Monday",
+            "empty.txt": "",
+            "docs/report.md": "quarterly BUDGET numbers\r\nsecond line",
+            "docs/old/mac.txt": "line one\rbudget\r",
+            "docs/unrelated.md": "nothing to see here",
+            ".hidden/secret.txt": "budget in a hidden folder",
+            "node_modules/pkg/readme.txt": "budget in an ignored folder",
+            "src/main.py": "# budgeting helpers\nprint('hi')\n",
+            "src/short.txt": "bud",
+        }
+        for rel, text in files.items():
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        os.symlink(root / "notes.txt", root / "docs" / "notes-link.txt")
+        os.symlink(root / "docs", root / "src" / "docs-link")
+
+    async def test_matches_baseline(self, sandbox):
+        """Test the same files match as with the original search"""
+        self._make_tree(sandbox)
+
+        for query, case_sensitive in [
+            ("budget", False),
+            ("BUDGET", True),
+            ("Budget", True),
+            ("second line", False),
+            ("missing", False),
+        ]:
+            result = await search_file_contents_tool(
+                context, str(sandbox), query, case_sensitive, include_ignored=True
+            )
+
+            assert result["success"] is True
+            assert sorted(result["data"]["matches"]) == baseline_search(
+                sandbox, query, case_sensitive
+            )
+
+    async def test_skips_ignored_folders_by_default(self, sandbox):
+        """Test IGNORED_DIRS are left out unless include_ignored is set"""
+        self._make_tree(sandbox)
+
+        result = await search_file_contents_tool(context, str(sandbox), "budget")
+
+        assert result["success"] is True
+        expected = [
+            match for match in baseline_search(sandbox, "budget")
+            if "node_modules" not in match
+        ]
+        assert sorted(result["data"]["matches"]) == expected
+
+
+class TestCacheInvalidation:
+    """Test that writes invalidate cached path validations and scans"""
+
+    async def test_created_file_is_readable_at_once(self, sandbox):
+        """Test a cached 'not found' is dropped when the file is created"""
+        path = str(sandbox / "new.txt")
+
+        result = await read_file_content_tool(context, path)
+        assert result["success"] is False
+
+        result = await create_file_tool(context, path, "hello")
+        assert result["success"] is True
+
+        result = await read_file_content_tool(context, path)
+        assert result["success"] is True
+
+    async def test_recursive_scan_sees_nested_write(self, sandbox):
+        """Test a recursive scan is not served stale after a write deep below"""
+        inner = sandbox / "projects" / "inner"
+        inner.mkdir(parents=True)
+        (inner / "first.txt").write_text("one", encoding="utf-8")
+
+        result = await scan_folder_tool(context, str(sandbox), recursive=True)
+        assert result["success"] is True
+        assert "second.txt" not in scanned_names(result)
+
+        # The top folder's mtime does not change, so only an explicit
+        # invalidation keeps the cached scan from being reused
+        top_mtime = os.stat(sandbox).st_mtime_ns
+        result = await create_file_tool(context, str(inner / "second.txt"), "two")
+        assert result["success"] is True
+        assert os.stat(sandbox).st_mtime_ns == top_mtime
+
+        result = await scan_folder_tool(context, str(sandbox), recursive=True)
+        assert result["success"] is True
+        assert "second.txt" in scanned_names(result)
@@ -7,8 +7,9 @@ from livekit.agents import function_tool, RunContext
 
 from utils.logger import get_logger
 from utils.path_utils import expand_user_path, validate_path
+from utils.cache import invalidate_path_caches
 from core.snapshot import SnapshotManager
-from core.audit_logger import AuditLogger
+from core.audit_logger import audit_logger
 from models.tool_results import ToolResult
 
 # Week 2 Security Imports
@@ -50,8 +51,7 @@ async def create_file_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="create_file",
                 status="blocked",
                 details={"path": str(file_path), "error": str(e)},
@@ -69,10 +69,11 @@ async def create_file_tool(
         full_content = template + content
 
         file_path.write_text(full_content, encoding="utf-8")
+        # A cached "not found" or scan would now miss the new path
+        invalidate_path_caches()
 
         # Week 2: Enhanced audit logging
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_file",
             status="success",
             details={"path": str(file_path), "size": len(full_content), "file_type": file_type},
@@ -90,8 +91,7 @@ async def create_file_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_file",
             status="failed",
             details={"path": str(path)},
@@ -123,8 +123,7 @@ async def create_folder_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="create_folder",
                 status="blocked",
                 details={"path": str(folder_path)},
@@ -138,10 +137,11 @@ async def create_folder_tool(
         validate_path(folder_path.parent, must_exist=True)
 
         folder_path.mkdir(parents=True, exist_ok=True)
+        # A cached "not found" or scan would now miss the new path
+        invalidate_path_caches()
 
         # Week 2: Enhanced audit logging
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_folder",
             status="success",
             details={"path": str(folder_path)},
@@ -159,8 +159,7 @@ async def create_folder_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_folder",
             status="failed",
             details={"path": str(path)},
@@ -271,8 +270,7 @@ async def create_any_files_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="create_any_files",
                 status="blocked",
                 details={"base_path": str(base_dir), "file_count": len(files)},
@@ -284,37 +282,41 @@ async def create_any_files_tool(
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
         
         validate_path(base_dir, must_exist=True)
-        base_dir.mkdir(parents=True, exist_ok=True)
 
         created_files: List[str] = []
 
-        for f in files:
-            name = f["name"]
-            content = f.get("content", "")
+        try:
+            base_dir.mkdir(parents=True, exist_ok=True)
+
+            for f in files:
+                name = f["name"]
+                content = f.get("content", "")
 
-            target = base_dir / name
+                target = base_dir / name
             
-            # Validate each file path
-            try:
-                validated_file = path_validator.validate_path(
-                    target,
-                    operation="write",
-                    must_exist=False
-                )
-            except (PathSecurityError, ValidationError) as e:
-                logger.warning(f"Skipping file due to security: {target} - {e}")
-                continue
+                # Validate each file path
+                try:
+                    validated_file = path_validator.validate_path(
+                        target,
+                        operation="write",
+                        must_exist=False
+                    )
+                except (PathSecurityError, ValidationError) as e:
+                    logger.warning(f"Skipping file due to security: {target} - {e}")
+                    continue
             
-            target.parent.mkdir(parents=True, exist_ok=True)
+                target.parent.mkdir(parents=True, exist_ok=True)
 
-            template = _resolve_template_for_file(target.name)
-            target.write_text(template + content, encoding="utf-8")
+                template = _resolve_template_for_file(target.name)
+                target.write_text(template + content, encoding="utf-8")
 
-            created_files.append(str(target))
+                created_files.append(str(target))
+        finally:
+            # Cached "not found" results and scans would now miss the new paths
+            invalidate_path_caches()
 
         # Week 2: Enhanced audit logging
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_any_files",
             status="success",
             details={"count": len(created_files), "files": created_files},
@@ -332,8 +334,7 @@ async def create_any_files_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_any_files",
             status="failed",
             details={"base_path": str(base_path)},
@@ -497,8 +498,7 @@ async def create_project_structure_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="create_project_structure",
                 status="blocked",
                 details={"path": str(root), "project_type": project_type},
@@ -510,19 +510,22 @@ async def create_project_structure_tool(
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
         
         validate_path(root.parent, must_exist=True)
-        root.mkdir(parents=True, exist_ok=True)
+        try:
+            root.mkdir(parents=True, exist_ok=True)
 
-        if project_type not in PROJECT_TEMPLATES:
-            return ToolResult(
-                success=False,
-                error=f"Unsupported project type: {project_type}",
-            ).to_dict()
+            if project_type not in PROJECT_TEMPLATES:
+                return ToolResult(
+                    success=False,
+                    error=f"Unsupported project type: {project_type}",
+                ).to_dict()
 
-        created_items = _create_structure(root, PROJECT_TEMPLATES[project_type])
+            created_items = _create_structure(root, PROJECT_TEMPLATES[project_type])
+        finally:
+            # Cached "not found" results and scans would now miss the new paths
+            invalidate_path_caches()
 
         # Week 2: Enhanced audit logging
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_project_structure",
             status="success",
             details={
@@ -555,8 +558,7 @@ async def create_project_structure_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="create_project_structure",
             status="failed",
             details={"path": str(path), "project_type": project_type},
@@ -1,4 +1,5 @@
 import send2trash
+from datetime import datetime
 from pathlib import Path
 from typing import List
 
@@ -6,14 +7,15 @@ from livekit.agents import function_tool, RunContext
 
 from utils.logger import get_logger
 from utils.path_utils import expand_user_path, validate_path
-from core.audit_logger import AuditLogger
+from utils.cache import invalidate_path_caches
+from core.audit_logger import audit_logger
 from core.safety import SafetyChecker
 from models.tool_results import ToolResult
 
 # Week 2 Security Imports
 from core.security import path_validator, security_enforcer
 from core.risk_assesment import risk_assessor
-from core.confirmation import ConfirmationManager
+from core.confirmation import confirmation_manager
 from core.backup_manager import backup_manager
 from core.exceptions import PathSecurityError, ValidationError
 
@@ -39,8 +41,7 @@ async def delete_files_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="delete_files",
                 status="blocked",
                 details={"file_count": len(files)},
@@ -57,7 +58,7 @@ async def delete_files_tool(
         safety.validate_operation("delete", validated_paths)
 
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="delete_files",
             paths=[str(p) for p in validated_paths],
@@ -85,8 +86,7 @@ async def delete_files_tool(
         ).to_dict()
         
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="delete_files",
             status="failed",
             details={"file_count": len(files)},
@@ -118,8 +118,7 @@ async def execute_delete(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="execute_delete",
                 status="blocked",
                 details={"file_count": len(files)},
@@ -137,8 +136,7 @@ async def execute_delete(
         )
         
         if not allowed:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="execute_delete",
                 status="blocked",
                 details={"file_count": len(files)},
@@ -150,13 +148,16 @@ async def execute_delete(
             return ToolResult(success=False, error=reason).to_dict()
 
         deleted = 0
-        for file_path in validated_paths:
-            send2trash.send2trash(str(file_path))
-            deleted += 1
+        try:
+            for file_path in validated_paths:
+                send2trash.send2trash(str(file_path))
+                deleted += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="delete_files",
             status="success",
             details={"count": deleted, "files": [str(f) for f in validated_paths]},
@@ -174,8 +175,7 @@ async def execute_delete(
         ).to_dict()
         
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="execute_delete",
             status="failed",
             details={"file_count": len(files)},
@@ -207,8 +207,7 @@ async def delete_folder_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="delete_folder",
                 status="blocked",
                 details={"path": str(folder)},
@@ -222,11 +221,10 @@ async def delete_folder_tool(
         validate_path(validated_path, must_exist=True)
 
         # Count files
-        import os
         file_count = sum(1 for _ in validated_path.rglob("*") if _.is_file())
 
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="delete_folder",
             paths=[str(validated_path)],
@@ -255,8 +253,7 @@ async def delete_folder_tool(
         ).to_dict()
         
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="delete_folder",
             status="failed",
             details={"path": str(path)},
@@ -288,8 +285,7 @@ async def delete_multiple_folders_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="delete_multiple_folders",
                 status="blocked",
                 details={"folder_count": len(paths)},
@@ -311,7 +307,7 @@ async def delete_multiple_folders_tool(
             )
 
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="delete_multiple_folders",
             paths=[str(p) for p in validated_paths],
@@ -341,8 +337,7 @@ async def delete_multiple_folders_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="delete_multiple_folders",
             status="failed",
             details={"folder_count": len(paths)},
@@ -374,8 +369,7 @@ async def delete_mixed_items_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="delete_mixed_items",
                 status="blocked",
                 details={"item_count": len(paths)},
@@ -401,7 +395,7 @@ async def delete_mixed_items_tool(
                 })
 
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="delete_mixed_items",
             paths=[str(p) for p in validated_paths],
@@ -430,8 +424,7 @@ async def delete_mixed_items_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="delete_mixed_items",
             status="failed",
             details={"item_count": len(paths)},
@@ -455,8 +448,6 @@ async def conditional_delete_preview_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        from datetime import datetime, timedelta
-
         folder = expand_user_path(path)
         
         # Week 2: Security validation
@@ -467,8 +458,7 @@ async def conditional_delete_preview_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="conditional_delete_preview",
                 status="blocked",
                 details={"path": str(folder)},
@@ -502,8 +492,7 @@ async def conditional_delete_preview_tool(
         )
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="conditional_delete_preview",
             status="success",
             details={
@@ -536,8 +525,7 @@ async def conditional_delete_preview_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="conditional_delete_preview",
             status="failed",
             details={"path": str(path)},
@@ -559,8 +547,7 @@ async def undo_last_delete_tool(
     
     try:
         # Week 2: Audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="undo_last_delete",
             status="failed",
             details={"reason": "OS trash restore not supported"},
@@ -578,8 +565,7 @@ async def undo_last_delete_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="undo_last_delete",
             status="failed",
             details={},
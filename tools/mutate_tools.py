@@ -1,3 +1,4 @@
+import os
 import shutil
 from pathlib import Path
 from typing import List
@@ -6,20 +7,25 @@ from livekit.agents import function_tool, RunContext
 
 from utils.logger import get_logger
 from utils.path_utils import expand_user_path, validate_path, get_safe_destination
+from utils.cache import invalidate_path_caches
 from core.snapshot import SnapshotManager
-from core.audit_logger import AuditLogger
+from tools.utility_tools import set_last_snapshot
+from core.audit_logger import audit_logger
 from core.safety import SafetyChecker
 from models.tool_results import ToolResult
 
 # Week 2 Security Imports
 from core.security import path_validator, security_enforcer
 from core.risk_assesment import risk_assessor
-from core.confirmation import ConfirmationManager
+from core.confirmation import confirmation_manager
 from core.backup_manager import backup_manager
 from core.exceptions import PathSecurityError, ValidationError
 
 logger = get_logger(__name__)
 
+# Global instance
+snapshot_mgr = SnapshotManager()
+
 
 @function_tool()
 async def move_files_tool(
@@ -47,8 +53,7 @@ async def move_files_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="move_files",
                 status="blocked",
                 details={"file_count": len(files), "destination": str(dest_folder)},
@@ -67,7 +72,7 @@ async def move_files_tool(
         safety.validate_operation("move", validated_files)
 
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="move_files",
             paths=[str(p) for p in validated_files],
@@ -95,16 +100,19 @@ async def move_files_tool(
             )
 
         # Create snapshot
-        snapshot_mgr = SnapshotManager()
         file_states = {}
 
         # Move files
         moved = 0
-        for file_path in validated_files:
-            dest = get_safe_destination(file_path, validated_dest)
-            file_states[str(dest)] = str(file_path)
-            shutil.move(str(file_path), str(dest))
-            moved += 1
+        try:
+            for file_path in validated_files:
+                dest = get_safe_destination(file_path, validated_dest)
+                file_states[str(dest)] = str(file_path)
+                shutil.move(str(file_path), str(dest))
+                moved += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         # Save snapshot
         snapshot = await snapshot_mgr.create_snapshot(
@@ -112,10 +120,11 @@ async def move_files_tool(
             file_states=file_states,
             metadata={"destination": str(validated_dest)},
         )
+        # Make it the target of undo_last_action_tool
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="move_files",
             status="success",
             details={"count": moved, "destination": str(validated_dest)},
@@ -135,8 +144,7 @@ async def move_files_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="move_files",
             status="failed",
             details={"file_count": len(files)},
@@ -175,8 +183,7 @@ async def copy_files_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="copy_files",
                 status="blocked",
                 details={"file_count": len(files)},
@@ -196,14 +203,17 @@ async def copy_files_tool(
 
         # Copy files
         copied = 0
-        for file_path in validated_files:
-            dest = get_safe_destination(file_path, validated_dest)
-            shutil.copy2(str(file_path), str(dest))
-            copied += 1
+        try:
+            for file_path in validated_files:
+                dest = get_safe_destination(file_path, validated_dest)
+                shutil.copy2(str(file_path), str(dest))
+                copied += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="copy_files",
             status="success",
             details={"count": copied, "destination": str(validated_dest)},
@@ -221,8 +231,7 @@ async def copy_files_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="copy_files",
             status="failed",
             details={"file_count": len(files)},
@@ -255,8 +264,7 @@ async def rename_file_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="rename",
                 status="blocked",
                 details={"path": str(file_path)},
@@ -279,8 +287,7 @@ async def rename_file_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="rename",
                 status="blocked",
                 details={"new_name": new_name},
@@ -292,18 +299,22 @@ async def rename_file_tool(
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
         # Create snapshot
-        snapshot_mgr = SnapshotManager()
         snapshot = await snapshot_mgr.create_snapshot(
             operation_type="rename",
             file_states={str(validated_new_path): str(validated_path)},
         )
 
         # Rename
-        validated_path.rename(validated_new_path)
+        try:
+            validated_path.rename(validated_new_path)
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
+        # Undoable only once the rename went through
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="rename",
             status="success",
             details={"old": str(validated_path), "new": str(validated_new_path)},
@@ -323,8 +334,7 @@ async def rename_file_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="rename",
             status="failed",
             details={"path": str(path)},
@@ -358,8 +368,7 @@ async def batch_rename_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="batch_rename",
                 status="blocked",
                 details={"count": len(paths), "mode": mode},
@@ -370,52 +379,59 @@ async def batch_rename_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        snapshot_mgr = SnapshotManager()
         file_states = {}
         renamed = []
 
-        for p in validated_paths:
-            validate_path(p, must_exist=True)
-
-            if mode == "prefix":
-                new_name = value + p.name
-            elif mode == "suffix":
-                stem, ext = p.stem, p.suffix
-                new_name = f"{stem}{value}{ext}"
-            elif mode == "replace":
-                old, new = value.split(":", 1)
-                new_name = p.name.replace(old, new)
-            else:
-                return ToolResult(
-                    success=False,
-                    error=f"Unsupported rename mode: {mode}",
-                ).to_dict()
-
-            new_path = p.parent / new_name
+        try:
+            for p in validated_paths:
+                validate_path(p, must_exist=True)
+
+                if mode == "prefix":
+                    new_name = value + p.name
+                elif mode == "suffix":
+                    stem, ext = p.stem, p.suffix
+                    new_name = f"{stem}{value}{ext}"
+                elif mode == "replace":
+                    old, new = value.split(":", 1)
+                    new_name = p.name.replace(old, new)
+                else:
+                    return ToolResult(
+                        success=False,
+                        error=f"Unsupported rename mode: {mode}",
+                    ).to_dict()
+
+                # Plain string join avoids a Path allocation per file
+                new_path = os.fspath(p.parent) + os.sep + new_name
             
-            # Validate new path
-            try:
-                validated_new = path_validator.validate_path(
-                    new_path,
-                    operation="write",
-                    must_exist=False
-                )
-            except (PathSecurityError, ValidationError):
-                logger.warning(f"Skipping rename due to security: {new_path}")
-                continue
+                # Validate new path
+                try:
+                    validated_new = path_validator.validate_path(
+                        new_path,
+                        operation="write",
+                        must_exist=False
+                    )
+                except (PathSecurityError, ValidationError):
+                    logger.warning(f"Skipping rename due to security: {new_path}")
+                    continue
             
-            file_states[str(validated_new)] = str(p)
-            p.rename(validated_new)
-            renamed.append(str(validated_new))
+                old_str = os.fspath(p)
+                new_str = os.fspath(validated_new)
+                file_states[new_str] = old_str
+                os.rename(old_str, new_str)
+                renamed.append(new_str)
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         snapshot = await snapshot_mgr.create_snapshot(
             operation_type="batch_rename",
             file_states=file_states,
         )
+        # Make it the target of undo_last_action_tool
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="batch_rename",
             status="success",
             details={"count": len(renamed), "mode": mode},
@@ -433,8 +449,7 @@ async def batch_rename_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="batch_rename",
             status="failed",
             details={"count": len(paths)},
@@ -473,8 +488,7 @@ async def move_folder_contents_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="move_folder_contents",
                 status="blocked",
                 details={"source": str(src), "destination": str(dst)},
@@ -488,24 +502,28 @@ async def move_folder_contents_tool(
         validate_path(validated_src, must_exist=True)
         validated_dst.mkdir(parents=True, exist_ok=True)
 
-        snapshot_mgr = SnapshotManager()
         file_states = {}
         moved = 0
 
-        for item in validated_src.iterdir():
-            dest = get_safe_destination(item, validated_dst)
-            file_states[str(dest)] = str(item)
-            shutil.move(str(item), str(dest))
-            moved += 1
+        try:
+            for item in validated_src.iterdir():
+                dest = get_safe_destination(item, validated_dst)
+                file_states[str(dest)] = str(item)
+                shutil.move(str(item), str(dest))
+                moved += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         snapshot = await snapshot_mgr.create_snapshot(
             operation_type="move_folder_contents",
             file_states=file_states,
         )
+        # Make it the target of undo_last_action_tool
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="move_folder_contents",
             status="success",
             details={"count": moved, "source": str(validated_src), "destination": str(validated_dst)},
@@ -523,8 +541,7 @@ async def move_folder_contents_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="move_folder_contents",
             status="failed",
             details={"source": str(source), "destination": str(destination)},
@@ -563,8 +580,7 @@ async def copy_folder_contents_tool(
                 must_exist=False
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="copy_folder_contents",
                 status="blocked",
                 details={"source": str(src), "destination": str(dst)},
@@ -580,17 +596,20 @@ async def copy_folder_contents_tool(
 
         copied = 0
 
-        for item in validated_src.iterdir():
-            dest = get_safe_destination(item, validated_dst)
-            if item.is_dir():
-                shutil.copytree(item, dest)
-            else:
-                shutil.copy2(item, dest)
-            copied += 1
+        try:
+            for item in validated_src.iterdir():
+                dest = get_safe_destination(item, validated_dst)
+                if item.is_dir():
+                    shutil.copytree(item, dest)
+                else:
+                    shutil.copy2(item, dest)
+                copied += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="copy_folder_contents",
             status="success",
             details={"count": copied, "source": str(validated_src), "destination": str(validated_dst)},
@@ -606,8 +625,7 @@ async def copy_folder_contents_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="copy_folder_contents",
             status="failed",
             details={"source": str(source), "destination": str(destination)},
@@ -641,8 +659,7 @@ async def bulk_change_extension_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="bulk_extension_change",
                 status="blocked",
                 details={"path": str(folder)},
@@ -655,25 +672,29 @@ async def bulk_change_extension_tool(
 
         validate_path(validated_folder, must_exist=True)
 
-        snapshot_mgr = SnapshotManager()
         file_states = {}
         changed = 0
 
-        for file in validated_folder.iterdir():
-            if file.is_file() and file.suffix == old_ext:
-                new_path = file.with_suffix(new_ext)
-                file_states[str(new_path)] = str(file)
-                file.rename(new_path)
-                changed += 1
+        try:
+            for file in validated_folder.iterdir():
+                if file.is_file() and file.suffix == old_ext:
+                    new_path = file.with_suffix(new_ext)
+                    file_states[str(new_path)] = str(file)
+                    file.rename(new_path)
+                    changed += 1
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
 
         snapshot = await snapshot_mgr.create_snapshot(
             operation_type="bulk_extension_change",
             file_states=file_states,
         )
+        # Make it the target of undo_last_action_tool
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="bulk_extension_change",
             status="success",
             details={"count": changed, "old_ext": old_ext, "new_ext": new_ext},
@@ -691,8 +712,7 @@ async def bulk_change_extension_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="bulk_extension_change",
             status="failed",
             details={"path": str(path)},
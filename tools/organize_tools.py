@@ -1,25 +1,222 @@
+import asyncio
+import errno
+import os
+import re
 import shutil
+import time
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 
 from livekit.agents import function_tool, RunContext
 
 from utils.logger import get_logger
-from utils.path_utils import expand_user_path, validate_path, get_safe_destination
-from utils.file_utils import scan_folder, group_by_category
+from utils.path_utils import expand_user_path, get_safe_destination
+from utils.file_utils import (
+    scan_and_group,
+    categorize_file,
+    calculate_folder_size,
+    parallel_walk,
+)
+from utils.cache import TTLCache, invalidate_path_caches
 from config.greetings import get_confirmation_message, get_success_message
 from core.snapshot import SnapshotManager
-from core.audit_logger import AuditLogger
+from tools.utility_tools import set_last_snapshot
+from core.audit_logger import audit_logger
 from models.tool_results import ToolResult
 
 # Week 2 Security Imports
 from core.security import path_validator, security_enforcer
 from core.risk_assesment import risk_assessor
-from core.confirmation import ConfirmationManager
+from core.confirmation import confirmation_manager
 from core.backup_manager import backup_manager
 from core.exceptions import PathSecurityError, ValidationError
 
 logger = get_logger(__name__)
 
+# Global instance
+snapshot_mgr = SnapshotManager()
+
+# Size bucket upper bounds (exclusive) and their folder names
+SIZE_THRESHOLDS = (1_000_000, 100_000_000)
+SIZE_LABELS = ("Small", "Medium", "Large")
+
+# Filename normalization: spaces and dashes become underscores
+NORMALIZE_TABLE = str.maketrans({" ": "_", "-": "_"})
+# ASCII names without these characters are already normalized
+NEEDS_NORMALIZE = re.compile(r"[ \-A-Z]")
+
+# Max file moves in flight during execute_organize
+MOVE_CONCURRENCY = 64
+
+
+# renameat(2) with directory fds (POSIX only; os.replace shares os.rename's support)
+_RENAMEAT = os.rename in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+
+def _move(src: str, dest: str, dir_fds: dict[str, int] | None = None) -> None:
+    """Rename in place, falling back to shutil.move across filesystems"""
+    try:
+        if dir_fds:
+            # Rename relative to already-open folders - no full path walk per file
+            src_dir, src_name = os.path.split(src)
+            dest_dir, dest_name = os.path.split(dest)
+            os.replace(
+                src_name,
+                dest_name,
+                src_dir_fd=dir_fds[src_dir],
+                dst_dir_fd=dir_fds[dest_dir],
+            )
+        else:
+            os.replace(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dest)
+
+
+def _open_dir_fds(pairs: list[tuple[str, str]]) -> dict[str, int]:
+    """Open every distinct source/destination folder once (empty if unsupported)"""
+    fds = {}
+    if not _RENAMEAT:
+        return fds
+    try:
+        for src, dest in pairs:
+            for parent in (os.path.dirname(src), os.path.dirname(dest)):
+                if parent not in fds:
+                    fds[parent] = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        for fd in fds.values():
+            os.close(fd)
+        return {}
+    return fds
+
+
+async def _move_all(pairs: list[tuple[str, str]]) -> list:
+    """Run moves in worker threads, at most MOVE_CONCURRENCY at a time
+
+    Returns one entry per pair: None on success, the exception otherwise.
+    """
+    semaphore = asyncio.Semaphore(MOVE_CONCURRENCY)
+    dir_fds = _open_dir_fds(pairs)
+
+    async def _move_one(src: str, dest: str):
+        async with semaphore:
+            await asyncio.to_thread(_move, src, dest, dir_fds)
+
+    try:
+        return await asyncio.gather(
+            *(_move_one(src, dest) for src, dest in pairs),
+            return_exceptions=True,
+        )
+    finally:
+        for fd in dir_fds.values():
+            os.close(fd)
+
+
+@lru_cache(maxsize=4096)
+def _month_key_for_bucket(bucket: int) -> str:
+    tm = time.localtime(bucket * 900)
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}"
+
+
+# Scan + grouping results shared by the organize previews and execute_organize.
+# Strategies are dispatched through GROUP_KEYS: one key function per strategy.
+_group_cache = TTLCache(max_size=128, ttl_seconds=60)
+
+
+def _category_key(entry: os.DirEntry, stat: os.stat_result) -> str:
+    return "Folder" if entry.is_dir() else categorize_file(Path(entry.path))
+
+
+def _date_key(entry: os.DirEntry, stat: os.stat_result) -> str:
+    # Local "YYYY-MM" of the mtime. UTC offsets are multiples of 15 minutes, so
+    # a local month boundary never falls inside a 15-minute bucket - entries in
+    # the same bucket share a key. Integer ns math avoids float division.
+    return _month_key_for_bucket(stat.st_mtime_ns // 900_000_000_000)
+
+
+def _size_key(entry: os.DirEntry, stat: os.stat_result) -> str:
+    # Folders are bucketed by the size of their contents, as in scan_folder
+    size = calculate_folder_size(entry.path)[0] if entry.is_dir() else stat.st_size
+    return SIZE_LABELS[bisect_right(SIZE_THRESHOLDS, size)]
+
+
+def _extension_key(entry: os.DirEntry, stat: os.stat_result) -> str:
+    _, dot, ext = entry.name.rpartition(".")
+    return ext.lower() if dot and ext else "no_extension"
+
+
+GROUP_KEYS = {
+    "by_file_type": _category_key,
+    "by_date": _date_key,
+    "by_size": _size_key,
+    "by_extension": _extension_key,
+}
+
+# Strategies whose groups depend only on entry names and types. Adding,
+# removing or renaming an entry bumps the folder mtime in the cache key, but
+# editing a file does not, so size and date groupings are never cached.
+CACHED_STRATEGIES = frozenset({"by_file_type", "by_extension"})
+
+
+def _group_files(folder: Path, strategy: str) -> dict[str, list[os.DirEntry]] | None:
+    """Scan folder and group its entries by strategy (None if strategy is unknown)"""
+    key_fn = GROUP_KEYS.get(strategy)
+    if key_fn is None:
+        return None
+
+    if strategy not in CACHED_STRATEGIES:
+        return scan_and_group(folder, key_fn)
+
+    key = (os.fspath(folder), os.stat(folder).st_mtime_ns, strategy)
+    groups = _group_cache.get(key)
+    if groups is None:
+        groups = scan_and_group(folder, key_fn)
+        _group_cache.set(key, groups)
+    return groups
+
+
+def _count_nested(root: Path) -> int:
+    """Count the files and folders below root's subfolders, skipping hidden ones like scan_folder"""
+    root_str = os.fspath(root)
+    counts = []
+
+    def visit(path: str, entries: list[os.DirEntry]) -> list[str]:
+        subfolders = []
+        nested = 0
+        for entry in entries:
+            # Skip hidden files and folders, like scan_folder
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+            if path != root_str:
+                # Top-level entries stay where they are
+                nested += 1
+        if nested:
+            counts.append(nested)
+        return subfolders
+
+    parallel_walk(root, visit)
+    return sum(counts)
+
+
+def _find_empty(root: Path) -> list[str]:
+    """Find empty directories below root with one scandir per directory, sorted by path"""
+    root_str = os.fspath(root)
+    empty = []
+
+    def visit(path: str, entries: list[os.DirEntry]) -> list[str]:
+        if not entries and path != root_str:
+            empty.append(path)
+        # d_type from the dirent - no stat needed
+        return [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+
+    # Sibling folders are scanned concurrently, so the order found varies
+    parallel_walk(root, visit)
+    return sorted(empty)
+
 
 @function_tool()
 async def organize_folder_tool(
@@ -41,8 +238,7 @@ async def organize_folder_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="organize_folder",
                 status="blocked",
                 details={"path": str(folder), "strategy": strategy},
@@ -53,37 +249,25 @@ async def organize_folder_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        # Scan folder
-        files = scan_folder(validated_folder, recursive=False)
+        # Scan folder and group by strategy
+        groups = _group_files(validated_folder, strategy)
+        if groups is None:
+            return ToolResult(success=False, error=f"Unknown strategy: {strategy}")
+        # Counts are computed once and shared by every payload below; the
+        # entry lists stay cached for execute_organize
+        group_counts = {k: len(v) for k, v in groups.items()}
+        file_count = sum(group_counts.values())
 
-        if not files:
+        if not file_count:
             return ToolResult(success=True, message="Folder is empty")
 
-        # Group by strategy
-        if strategy == "by_file_type":
-            groups = group_by_category(files)
-        elif strategy == "by_date":
-            from datetime import datetime
-
-            groups = {}
-            for f in files:
-                date = datetime.fromtimestamp(f.modified_at)
-                month_key = date.strftime("%Y-%m")
-                if month_key not in groups:
-                    groups[month_key] = []
-                groups[month_key].append(f)
-        else:
-            return ToolResult(success=False, error=f"Unknown strategy: {strategy}")
-
         # Week 2: Risk assessment & confirmation
-        cm = ConfirmationManager()
+        cm = confirmation_manager
         requires_conf, op_id, risk = await cm.request_confirmation(
             operation="organize_folder",
             paths=[str(validated_folder)],
             user_id=user_id,
-            file_count=len(files),
+            file_count=file_count,
             folder_count=len(groups),
             strategy=strategy
         )
@@ -97,9 +281,9 @@ async def organize_folder_tool(
                 data={
                     "path": str(validated_folder),
                     "strategy": strategy,
-                    "file_count": len(files),
+                    "file_count": file_count,
                     "folder_count": len(groups),
-                    "groups": {k: len(v) for k, v in groups.items()},
+                    "groups": group_counts,
                     "operation_id": op_id
                 },
             ).to_dict()
@@ -109,21 +293,20 @@ async def organize_folder_tool(
             success=True,
             requires_confirmation=True,
             confirmation_message=(
-                f"Organize {len(files)} files into {len(groups)} folders "
+                f"Organize {file_count} files into {len(groups)} folders "
                 f"using strategy '{strategy}'?"
             ),
             data={
                 "path": str(validated_folder),
                 "strategy": strategy,
-                "file_count": len(files),
+                "file_count": file_count,
                 "folder_count": len(groups),
-                "groups": {k: len(v) for k, v in groups.items()},
+                "groups": group_counts,
             },
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="organize_folder",
             status="failed",
             details={"path": str(path), "strategy": strategy},
@@ -156,8 +339,7 @@ async def execute_organize(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="execute_organize",
                 status="blocked",
                 details={"path": str(folder), "strategy": strategy},
@@ -168,41 +350,55 @@ async def execute_organize(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        files = scan_folder(validated_folder, recursive=False)
-
-        # Group files
-        if strategy == "by_file_type":
-            groups = group_by_category(files)
-        elif strategy == "by_date":
-            from datetime import datetime
-
-            groups = {}
-            for f in files:
-                date = datetime.fromtimestamp(f.modified_at)
-                month_key = date.strftime("%Y-%m")
-                if month_key not in groups:
-                    groups[month_key] = []
-                groups[month_key].append(f)
-        else:
-            groups = {}
-
-        # Create snapshot
-        snapshot_mgr = SnapshotManager()
-        file_states = {}
-        folders_created = []
-
-        # Move files
-        moved = 0
-        for group_name, group_files in groups.items():
-            group_folder = validated_folder / group_name
-            group_folder.mkdir(exist_ok=True)
-            folders_created.append(group_folder)
-
-            for file_info in group_files:
-                dest = get_safe_destination(file_info.path, group_folder)
-                file_states[dest] = file_info.path
-                shutil.move(str(file_info.path), str(dest))
-                moved += 1
+        # Reuses the preview's scan/grouping if the folder is unchanged (name-based
+        # strategies only; see CACHED_STRATEGIES)
+        groups = _group_files(validated_folder, strategy) or {}
+
+        # Create every group folder before any move
+        folder_str = os.fspath(validated_folder)
+        folders_created = [folder_str + os.sep + group_name for group_name in groups]
+        for group_folder_str in folders_created:
+            os.makedirs(group_folder_str, exist_ok=True)
+
+        # Plan moves. A source that is itself a group folder (an existing
+        # Documents/, say) is a destination and stays where it is.
+        group_folder_set = set(folders_created)
+        file_pairs = []
+        folder_pairs = []
+        for group_folder_str, group_files in zip(folders_created, groups.values()):
+            for entry in group_files:
+                src = entry.path
+                if src in group_folder_set:
+                    continue
+                dest = group_folder_str + os.sep + entry.name
+                if os.path.lexists(dest):
+                    # Name clash: let get_safe_destination pick a numbered name
+                    dest = os.fspath(get_safe_destination(Path(src), Path(group_folder_str)))
+                (folder_pairs if entry.is_dir() else file_pairs).append((src, dest))
+
+        # Move files concurrently, then folders once no file move is in
+        # flight, so no folder is renamed under a move still using it. Only
+        # successful moves go into the snapshot.
+        try:
+            results = await _move_all(file_pairs)
+            results += await _move_all(folder_pairs)
+        finally:
+            # Paths changed: cached validations and scans may be stale
+            invalidate_path_caches()
+        pairs = file_pairs + folder_pairs
+        file_states = {
+            dest: src for (src, dest), error in zip(pairs, results) if error is None
+        }
+        failed = [
+            f"{src}: {error}" for (src, _), error in zip(pairs, results) if error is not None
+        ]
+        moved = len(file_states)
+
+        if failed:
+            logger.warning(
+                "organize_moves_failed",
+                extra={"failed": len(failed), "first_error": failed[0]}
+            )
 
         # Save snapshot
         snapshot = await snapshot_mgr.create_snapshot(
@@ -211,10 +407,11 @@ async def execute_organize(
             folders_created=folders_created,
             metadata={"strategy": strategy},
         )
+        # Make it the target of undo_last_action_tool
+        set_last_snapshot(snapshot.snapshot_id, snapshot.size_bytes)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="organize_folder",
             status="success",
             details={"path": str(validated_folder), "strategy": strategy, "moved": moved},
@@ -228,14 +425,13 @@ async def execute_organize(
 
         return ToolResult(
             success=True,
-            data={"moved": moved, "folders": len(groups)},
+            data={"moved": moved, "failed": len(failed), "folders": len(groups)},
             message=f"Organized {moved} files into {len(groups)} folders",
             snapshot_id=snapshot.snapshot_id,
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="execute_organize",
             status="failed",
             details={"path": str(path), "strategy": strategy},
@@ -267,8 +463,7 @@ async def organize_by_size_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="organize_by_size",
                 status="blocked",
                 details={"path": str(folder)},
@@ -279,30 +474,16 @@ async def organize_by_size_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        files = scan_folder(validated_folder, recursive=False)
-
-        groups = {
-            "Small": [],
-            "Medium": [],
-            "Large": [],
-        }
-
-        for f in files:
-            if f.size_bytes < 1_000_000:
-                groups["Small"].append(f)
-            elif f.size_bytes < 100_000_000:
-                groups["Medium"].append(f)
-            else:
-                groups["Large"].append(f)
+        # Grouped during the scan; execute_organize reuses it while unchanged
+        groups = _group_files(validated_folder, "by_size")
+        group_counts = {label: len(groups.get(label, ())) for label in SIZE_LABELS}
+        total = sum(group_counts.values())
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="organize_by_size",
             status="pending",
-            details={"path": str(validated_folder), "file_count": len(files)},
+            details={"path": str(validated_folder), "file_count": total},
             user_id=user_id,
             risk_level="medium",
             paths=[str(validated_folder)]
@@ -311,17 +492,16 @@ async def organize_by_size_tool(
         return ToolResult(
             success=True,
             requires_confirmation=True,
-            confirmation_message=f"Organize {len(files)} files by size?",
+            confirmation_message=f"Organize {total} files by size?",
             data={
                 "path": str(validated_folder),
-                "groups": {k: len(v) for k, v in groups.items()},
+                "groups": group_counts,
                 "strategy": "by_size",
             },
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="organize_by_size",
             status="failed",
             details={"path": str(path)},
@@ -353,8 +533,7 @@ async def organize_by_extension_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="organize_by_extension",
                 status="blocked",
                 details={"path": str(folder)},
@@ -365,21 +544,16 @@ async def organize_by_extension_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        files = scan_folder(validated_folder, recursive=False)
-        groups = {}
-
-        for f in files:
-            ext = f.path.suffix.lower().lstrip(".") or "no_extension"
-            groups.setdefault(ext, []).append(f)
+        # Grouped during the scan; execute_organize reuses it while unchanged
+        groups = _group_files(validated_folder, "by_extension")
+        group_counts = {k: len(v) for k, v in groups.items()}
+        total = sum(group_counts.values())
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="organize_by_extension",
             status="pending",
-            details={"path": str(validated_folder), "file_count": len(files)},
+            details={"path": str(validated_folder), "file_count": total},
             user_id=user_id,
             risk_level="medium",
             paths=[str(validated_folder)]
@@ -388,17 +562,16 @@ async def organize_by_extension_tool(
         return ToolResult(
             success=True,
             requires_confirmation=True,
-            confirmation_message=f"Organize {len(files)} files by extension?",
+            confirmation_message=f"Organize {total} files by extension?",
             data={
                 "path": str(validated_folder),
                 "strategy": "by_extension",
-                "groups": {k: len(v) for k, v in groups.items()},
+                "groups": group_counts,
             },
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="organize_by_extension",
             status="failed",
             details={"path": str(path)},
@@ -430,8 +603,7 @@ async def normalize_filenames_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="normalize_filenames",
                 status="blocked",
                 details={"path": str(folder)},
@@ -442,23 +614,20 @@ async def normalize_filenames_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        files = scan_folder(validated_folder, recursive=False)
+        # Only names are needed - read them straight from the directory entries
+        with os.scandir(validated_folder) as it:
+            names = [entry.name for entry in it if not entry.name.startswith('.')]
 
         preview = {}
-        for f in files:
-            new_name = (
-                f.path.name.lower()
-                .replace(" ", "_")
-                .replace("-", "_")
-            )
-            if new_name != f.path.name:
-                preview[f.path.name] = new_name
+        for name in names:
+            if name.isascii() and not NEEDS_NORMALIZE.search(name):
+                continue
+            new_name = name.lower().translate(NORMALIZE_TABLE)
+            if new_name != name:
+                preview[name] = new_name
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="normalize_filenames",
             status="pending",
             details={"path": str(validated_folder), "changes": len(preview)},
@@ -479,8 +648,7 @@ async def normalize_filenames_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="normalize_filenames",
             status="failed",
             details={"path": str(path)},
@@ -512,8 +680,7 @@ async def flatten_folder_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="flatten_folder",
                 status="blocked",
                 details={"path": str(folder)},
@@ -524,17 +691,13 @@ async def flatten_folder_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        files = scan_folder(validated_folder, recursive=True)
-        preview = [str(f.path) for f in files if f.path.parent != validated_folder]
+        file_count = await asyncio.to_thread(_count_nested, validated_folder)
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="flatten_folder",
             status="pending",
-            details={"path": str(validated_folder), "file_count": len(preview)},
+            details={"path": str(validated_folder), "file_count": file_count},
             user_id=user_id,
             risk_level="high",
             paths=[str(validated_folder)]
@@ -543,17 +706,16 @@ async def flatten_folder_tool(
         return ToolResult(
             success=True,
             requires_confirmation=True,
-            confirmation_message=f"Flatten folder by moving {len(preview)} files?",
+            confirmation_message=f"Flatten folder by moving {file_count} files?",
             data={
                 "path": str(validated_folder),
-                "file_count": len(preview),
+                "file_count": file_count,
                 "strategy": "flatten",
             },
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="flatten_folder",
             status="failed",
             details={"path": str(path)},
@@ -585,8 +747,7 @@ async def clean_empty_folders_tool(
                 must_exist=True
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
+            await audit_logger.log_operation(
                 operation_type="clean_empty_folders",
                 status="blocked",
                 details={"path": str(folder)},
@@ -597,16 +758,10 @@ async def clean_empty_folders_tool(
             )
             return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
 
-        validate_path(validated_folder, must_exist=True)
-
-        empty_folders = [
-            str(p) for p in validated_folder.rglob("*")
-            if p.is_dir() and not any(p.iterdir())
-        ]
+        empty_folders = await asyncio.to_thread(_find_empty, validated_folder)
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="clean_empty_folders",
             status="pending",
             details={"path": str(validated_folder), "empty_count": len(empty_folders)},
@@ -627,8 +782,7 @@ async def clean_empty_folders_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
+        await audit_logger.log_operation(
             operation_type="clean_empty_folders",
             status="failed",
             details={"path": str(path)},
@@ -1,21 +1,361 @@
+import asyncio
+import fnmatch
+import io
+import mmap
+import os
+import re
+import stat as stat_module
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
 
 from livekit.agents import function_tool, RunContext
 
+from config.settings import settings
 from utils.logger import get_logger
-from utils.path_utils import expand_user_path, validate_path
-from utils.file_utils import scan_folder, categorize_file, FileInfo
+from utils.path_utils import expand_user_path
+from utils.file_utils import (
+    scan_folder_cached,
+    categorize_file,
+    parallel_walk,
+    humanize_bytes,
+    IGNORED_DIRS,
+)
+from utils.cache import read_path_cache
 from models.tool_results import ToolResult
 
 from core.security import path_validator
-from core.audit import AuditLogger
+from core.audit_logger import audit_logger
 from core.exceptions import PathSecurityError, ValidationError
 
 logger = get_logger(__name__)
 
 MAX_READ_SIZE = 1024 * 10000  # 10MB safety limit
 
+SEARCH_BATCH_SIZE = 256  # Files pulled from the walk per content-search batch
+MMAP_THRESHOLD = 1024 * 1024  # Search files above 1MB through mmap
+TAIL_CHUNK_SIZE = 64 * 1024
+COUNT_CHUNK_SIZE = 1024 * 1024
+SEARCH_CHUNK_SIZE = 1024 * 1024
+
+# Content search treats a file as binary (like grep -I) when a NUL byte shows
+# up in its first BINARY_SNIFF_SIZE bytes; these suffixes are skipped unopened
+BINARY_SNIFF_SIZE = 512
+BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp",
+    ".pdf", ".zip", ".tar", ".gz", ".bz2", ".xz", ".7z", ".rar",
+    ".so", ".dll", ".dylib", ".exe", ".bin", ".o", ".a", ".pyc", ".class",
+    ".mp3", ".mp4", ".mov", ".avi", ".wav", ".flac",
+})
+
+# Project types in priority order, each with the top-level files that mark it.
+# "all" markers must all be present; "any" needs just one.
+PROJECT_MARKERS = (
+    ("nextjs", "all", frozenset({"package.json", "next.config.js"})),
+    ("nodejs", "all", frozenset({"package.json"})),
+    ("python", "any", frozenset({"requirements.txt", "pyproject.toml"})),
+    ("conda_ml", "any", frozenset({"environment.yml"})),
+    ("dockerized_app", "any", frozenset({"dockerfile"})),
+)
+
+# Every file name detect_project_type looks for
+PROJECT_SIGNATURES = frozenset().union(*(names for _, _, names in PROJECT_MARKERS))
+
+# ASCII-only lowercasing for raw bytes
+LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+@lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> Callable[[str], Any]:
+    """
+    Compile a glob into a case-insensitive filename matcher
+
+    Returns the regex's bound match method, so filtering makes one C-level
+    call per name instead of running a Python predicate. Cached, since
+    agents tend to repeat the same few patterns.
+    """
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+
+
+async def _resolve_read_path(path: str, operation_type: str, user_id: str, **details) -> Path:
+    """
+    Expand and validate a path for reading
+
+    path_validator applies the full legacy policy (hidden folders and the
+    config.policies system prefixes), so nothing reaches the cache without
+    it. Blocked paths are audited here and the security error is re-raised for
+    the tool to turn into its result. Results (errors included) are cached
+    in read_path_cache, keyed on the raw path, so back-to-back tools on one
+    folder validate it once. Tools that change the filesystem clear it.
+    """
+    cached = read_path_cache.get(path)
+    if cached is None:
+        target = expand_user_path(path)
+        try:
+            cached = path_validator.validate_path(target, operation="read", must_exist=True)
+        except (PathSecurityError, ValidationError) as e:
+            # Missing and blocked paths are cached too, so retries stay cheap
+            cached = (target, e)
+        read_path_cache.set(path, cached)
+
+    if isinstance(cached, Path):
+        return cached
+
+    target, error = cached
+    await audit_logger.log_operation(
+        operation_type=operation_type,
+        status="blocked",
+        details={"path": str(target), **details},
+        user_id=user_id,
+        risk_level="blocked",
+        paths=[str(target)],
+        error=str(error)
+    )
+    raise error
+
+
+async def _audit_failure(operation_type: str, user_id: str, path: str, error: Exception, **details):
+    """Audit a read tool that failed unexpectedly"""
+    await audit_logger.log_operation(
+        operation_type=operation_type,
+        status="failed",
+        details={"path": str(path), **details},
+        user_id=user_id,
+        risk_level="unknown",
+        paths=[str(path)],
+        error=str(error)
+    )
+
+
+def _ignored_dirs(include_ignored: bool) -> frozenset:
+    """Folder names a walk skips: IGNORED_DIRS unless the caller opts in"""
+    return frozenset() if include_ignored else IGNORED_DIRS
+
+
+def _walk_file_batches(
+    root: str,
+    batch_size: int = SEARCH_BATCH_SIZE,
+    ignored: frozenset = IGNORED_DIRS,
+) -> Iterator[tuple[list[int], list[tuple[int, str, str]]]]:
+    """
+    Group the files under root into batches of (dir_fd, dirpath, name)
+
+    os.fwalk closes each directory fd as soon as the walk moves on, so every
+    directory chunk in a batch gets its own duplicate. A batch is yielded as
+    (fds, files) and the caller owns, and must close, the fds.
+    """
+    fds, files = [], []
+    try:
+        for dirpath, dirnames, filenames, dir_fd in os.fwalk(root):
+            dirnames[:] = [d for d in dirnames if d not in ignored]
+            names = iter([
+                name for name in filenames
+                if os.path.splitext(name)[1].lower() not in BINARY_EXTENSIONS
+            ])
+            while chunk := list(islice(names, batch_size - len(files))):
+                fd = os.dup(dir_fd)
+                fds.append(fd)
+                files.extend((fd, dirpath, name) for name in chunk)
+                if len(files) >= batch_size:
+                    batch, fds, files = (fds, files), [], []
+                    yield batch
+        if files:
+            batch, fds, files = (fds, files), [], []
+            yield batch
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _head_lines(path: Path, n: int) -> list[str]:
+    """Read only the first n lines of a text file"""
+    with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+        return [line.rstrip("\n") for line in islice(fh, max(n, 0))]
+
+
+def _tail_lines(path: Path, n: int, chunk_size: int = TAIL_CHUNK_SIZE) -> list[str]:
+    """Read the last n lines of a text file, seeking back from the end"""
+    if n <= 0:
+        return []
+
+    with open(path, "rb") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        buf = b""
+        # One extra newline guarantees the first kept line is complete
+        while end > 0 and buf.count(b"\n") <= n:
+            read_size = min(chunk_size, end)
+            end -= read_size
+            fh.seek(end)
+            buf = fh.read(read_size) + buf
+
+    return buf.decode("utf-8", errors="ignore").splitlines()[-n:]
+
+
+def _count_lines(fh: io.BufferedIOBase) -> int:
+    """
+    Count lines from the current position by scanning raw bytes, without decoding
+
+    Matches read_text().splitlines() for LF, CR and CRLF line endings,
+    including a CRLF split across two chunks. The rarer separators
+    splitlines() also breaks on (vertical tab, form feed, the file, group
+    and record separators, NEL, U+2028/U+2029) are not counted.
+    """
+    count = 0
+    last = b""
+    while chunk := fh.read(COUNT_CHUNK_SIZE):
+        count += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+        # A CR ending the previous chunk was already counted as a break
+        if last == b"\r" and chunk[:1] == b"\n":
+            count -= 1
+        last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    if last and last not in (b"\n", b"\r"):
+        count += 1
+    return count
+
+
+def _read_preview(path: Path, max_lines: int) -> tuple[list[str], int] | None:
+    """
+    First max_lines lines plus the total line count, from a single open
+
+    The size limit is checked with fstat on the open file instead of a
+    separate stat by path. Returns None if the file is too large.
+    """
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size > MAX_READ_SIZE:
+            return None
+
+        text = io.TextIOWrapper(fh, encoding="utf-8", errors="ignore")
+        preview = [line.rstrip("\n") for line in islice(text, max(max_lines, 0))]
+        text.detach()
+
+        fh.seek(0)
+        return preview, _count_lines(fh)
+
+
+def _make_matcher(query: str, case_sensitive: bool) -> Callable[[Any], bool]:
+    """
+    Compile a content query once into a matcher for bytes or mmap buffers
+
+    Every file in a search is checked with the same matcher, so the needle
+    is encoded and lowercased a single time rather than per file.
+    """
+    if case_sensitive:
+        needle = query.encode("utf-8")
+        return lambda buffer: buffer.find(needle) != -1
+
+    if not query.isascii():
+        # bytes.lower() only folds ASCII, so fall back to a decoded copy
+        needle_text = query.lower()
+        return lambda buffer: needle_text in bytes(buffer).decode("utf-8", errors="ignore").lower()
+
+    # Lowercase one window at a time so a large file never gets a full
+    # lowered copy; windows overlap so matches can't straddle a boundary
+    needle = query.encode("utf-8").translate(LOWER_TABLE)
+    window_size = max(SEARCH_CHUNK_SIZE, 2 * len(needle))
+    step = window_size - len(needle) + 1
+
+    def contains(buffer) -> bool:
+        for start in range(0, max(len(buffer) - len(needle), 0) + 1, step):
+            window = buffer[start:start + window_size]
+            if window.translate(LOWER_TABLE).find(needle) != -1:
+                return True
+        return False
+
+    return contains
+
+
+def _scan_one(dir_fd: int, name: str, contains: Callable[[Any], bool], min_size: int = 0) -> bool:
+    """Check whether a single text file matches, skipping files too small to hold the needle"""
+    # Open relative to the directory fd and fstat the descriptor, so the
+    # kernel never re-resolves the full path. Symlinks are followed like the
+    # old rglob + is_file() scan did, so a link to a regular file is searched;
+    # links to directories never get here because os.fwalk lists them under
+    # dirnames and does not descend into them. O_NONBLOCK keeps a FIFO from
+    # blocking the open; anything but a regular file is rejected after fstat.
+    try:
+        fd = os.open(name, os.O_RDONLY | os.O_NONBLOCK, dir_fd=dir_fd)
+    except OSError:
+        return False
+
+    try:
+        st = os.fstat(fd)
+        size = st.st_size
+        if not stat_module.S_ISREG(st.st_mode):
+            return False
+        if size > MAX_READ_SIZE or size < min_size:
+            return False
+        if size == 0:
+            return contains(b"")
+
+        if size < MMAP_THRESHOLD:
+            with open(fd, "rb", closefd=False) as fh:
+                data = fh.read()
+            return data.find(b"\0", 0, BINARY_SNIFF_SIZE) == -1 and contains(data)
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b"\0", 0, BINARY_SNIFF_SIZE) == -1 and contains(mm)
+    except (OSError, ValueError):
+        return False
+    finally:
+        os.close(fd)
+
+
+def _scan_batch(
+    pool: ThreadPoolExecutor,
+    fds: list[int],
+    files: list[tuple[int, str, str]],
+    contains: Callable[[Any], bool],
+    min_size: int,
+) -> list[bool]:
+    """Scan one batch on the pool, then close the batch's directory fds"""
+    # The fds are closed here, after every read in the batch has finished,
+    # rather than by the awaiting coroutine, which may be cancelled while
+    # reads are still in flight
+    try:
+        return list(pool.map(lambda f: _scan_one(f[0], f[2], contains, min_size), files))
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+async def _iter_matches(
+    root: Path,
+    contains: Callable[[Any], bool],
+    min_size: int = 0,
+    ignored: frozenset = IGNORED_DIRS,
+) -> AsyncIterator[str]:
+    """
+    Yield paths of files under root that match, as they are found
+
+    The walk is pulled in fixed-size batches so only one batch of files is
+    held at a time, and each batch is read on a bounded thread pool. Match
+    paths are only joined for hits.
+    """
+    batches = _walk_file_batches(os.fspath(root), ignored=ignored)
+    # PARALLEL_SEARCH=false reads one file at a time, for debugging
+    concurrency = settings.SEARCH_CONCURRENCY if settings.PARALLEL_SEARCH else 1
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    try:
+        while (pulled := await asyncio.to_thread(next, batches, None)) is not None:
+            fds, files = pulled
+            hits = await asyncio.to_thread(_scan_batch, pool, fds, files, contains, min_size)
+            for (_, dirpath, name), hit in zip(files, hits):
+                if hit:
+                    yield os.path.join(dirpath, name)
+    finally:
+        pool.shutdown(wait=False)
+        try:
+            # Releases the fds fwalk holds open; if a pull is still running
+            # the walk is closed when that thread drops it instead
+            batches.close()
+        except ValueError:
+            pass
+
 
 @function_tool()
 async def scan_folder_tool(
@@ -27,47 +367,28 @@ async def scan_folder_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        folder = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_folder = path_validator.validate_path(
-                folder,
-                operation="read",
-                must_exist=True
-            )
+            validated_folder = await _resolve_read_path(path, "scan_folder", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="scan_folder",
-                status="blocked",
-                details={"path": str(folder)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(folder)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
-        validate_path(validated_folder, must_exist=True)
+        # Off the event loop: a recursive scan of a large tree can take seconds
+        files = await asyncio.to_thread(scan_folder_cached, validated_folder, recursive)
 
-        files = scan_folder(validated_folder, recursive)
-
-        # Group by category
-        categories = {}
+        # Group by category and total the sizes in the same pass
+        categories = defaultdict(list)
+        total_size = 0
         for f in files:
-            cat = f.category
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append({
+            total_size += f.size_bytes
+            categories[f.category].append({
                 "name": f.path.name,
                 "size": f.size_human,
                 "sensitive": f.is_sensitive,
             })
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="scan_folder",
             status="success",
             details={"file_count": len(files), "recursive": recursive},
@@ -88,7 +409,7 @@ async def scan_folder_tool(
             success=True,
             data={
                 "total_files": len(files),
-                "total_size": sum(f.size_bytes for f in files),
+                "total_size": total_size,
                 "categories": {k: len(v) for k, v in categories.items()},
                 "files_by_category": categories,
             },
@@ -96,18 +417,9 @@ async def scan_folder_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="scan_folder",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("scan_folder", user_id, path, e)
         logger.error("scan_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -116,49 +428,39 @@ async def search_files_tool(
     path: str,
     pattern: str | None = None,
     file_type: str | None = None,
+    include_ignored: bool = False,
 ) -> dict:
-    """Search for files"""
+    """
+    Search for files
+
+    Folders such as node_modules, build and venv (IGNORED_DIRS) are skipped
+    unless include_ignored is set.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        folder = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_folder = path_validator.validate_path(
-                folder,
-                operation="read",
-                must_exist=True
+            validated_folder = await _resolve_read_path(
+                path, "search_files", user_id, pattern=pattern
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="search_files",
-                status="blocked",
-                details={"path": str(folder), "pattern": pattern},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(folder)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_folder, must_exist=True)
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
-        files = scan_folder(validated_folder, recursive=True)
+        files = await asyncio.to_thread(
+            scan_folder_cached, validated_folder, recursive=True,
+            ignored=_ignored_dirs(include_ignored)
+        )
 
-        # Filter by pattern
-        if pattern:
-            import fnmatch
+        # Filter by pattern and type in a single pass
+        if pattern or file_type:
+            name_matches = _compile_glob(pattern) if pattern else None
             files = [
                 f for f in files
-                if fnmatch.fnmatch(f.path.name.lower(), pattern.lower())
+                if (not file_type or f.category == file_type)
+                and (name_matches is None or name_matches(f.path.name))
             ]
 
-        # Filter by type
-        if file_type:
-            files = [f for f in files if f.category == file_type]
-
         results = [
             {
                 "path": str(f.path),
@@ -169,8 +471,7 @@ async def search_files_tool(
         ]
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="search_files",
             status="success",
             details={"pattern": pattern, "file_type": file_type, "results": len(results)},
@@ -197,18 +498,9 @@ async def search_files_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="search_files",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("search_files", user_id, path, e)
         logger.error("search_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -220,52 +512,28 @@ async def get_file_info_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        file_path = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_path = path_validator.validate_path(
-                file_path,
-                operation="read",
-                must_exist=True
-            )
+            validated_path = await _resolve_read_path(path, "get_file_info", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="get_file_info",
-                status="blocked",
-                details={"path": str(file_path)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(file_path)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_path, must_exist=True)
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
         stat = validated_path.stat()
 
         info = {
             "name": validated_path.name,
             "size_bytes": stat.st_size,
-            "size_human": FileInfo(
-                validated_path,
-                stat.st_size,
-                "",
-                False,
-                0,
-            ).size_human,
+            "size_human": humanize_bytes(stat.st_size),
             "category": categorize_file(validated_path),
             "extension": validated_path.suffix,
             "modified": stat.st_mtime,
-            "is_file": validated_path.is_file(),
-            "is_dir": validated_path.is_dir(),
+            # Derived from the stat above rather than two more stat calls
+            "is_file": stat_module.S_ISREG(stat.st_mode),
+            "is_dir": stat_module.S_ISDIR(stat.st_mode),
         }
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="get_file_info",
             status="success",
             details={"size": stat.st_size},
@@ -279,18 +547,9 @@ async def get_file_info_tool(
         return ToolResult(success=True, data=info).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="get_file_info",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("get_file_info", user_id, path, e)
         logger.error("file_info_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -303,49 +562,24 @@ async def read_file_content_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        file_path = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_path = path_validator.validate_path(
-                file_path,
-                operation="read",
-                must_exist=True
-            )
+            validated_path = await _resolve_read_path(path, "read_file_content", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="read_file_content",
-                status="blocked",
-                details={"path": str(file_path)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(file_path)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_path, must_exist=True)
-
-        if validated_path.stat().st_size > MAX_READ_SIZE:
-            return ToolResult(
-                success=False,
-                error="File too large to read safely",
-            ).to_dict()
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
         try:
-            lines = validated_path.read_text(encoding="utf-8", errors="ignore").splitlines()
+            # Reads run in a worker thread so they don't block the event loop
+            result = await asyncio.to_thread(_read_preview, validated_path, max_lines)
         except Exception:
-            return ToolResult(
-                success=False,
-                error="File is not readable as text",
-            ).to_dict()
+            return ToolResult.error_dict("File is not readable as text")
 
-        preview = lines[:max_lines]
+        if result is None:
+            return ToolResult.error_dict("File too large to read safely")
+        preview, total_lines = result
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="read_file_content",
             status="success",
             details={"lines_read": len(preview), "max_lines": max_lines},
@@ -360,7 +594,7 @@ async def read_file_content_tool(
             success=True,
             data={
                 "path": str(validated_path),
-                "total_lines": len(lines),
+                "total_lines": total_lines,
                 "preview_lines": len(preview),
                 "content": preview,
             },
@@ -368,18 +602,9 @@ async def read_file_content_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="read_file_content",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("read_file_content", user_id, path, e)
         logger.error("file_read_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -393,40 +618,20 @@ async def preview_file_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        file_path = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_path = path_validator.validate_path(
-                file_path,
-                operation="read",
-                must_exist=True
-            )
+            validated_path = await _resolve_read_path(path, "preview_file", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="preview_file",
-                status="blocked",
-                details={"path": str(file_path)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(file_path)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_path, must_exist=True)
-
-        content = validated_path.read_text(encoding="utf-8", errors="ignore").splitlines()
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
+        # Only read as much of the file as the preview needs
         if mode == "tail":
-            preview = content[-lines:]
+            preview = await asyncio.to_thread(_tail_lines, validated_path, lines)
         else:
-            preview = content[:lines]
+            preview = await asyncio.to_thread(_head_lines, validated_path, lines)
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="preview_file",
             status="success",
             details={"mode": mode, "lines": lines},
@@ -447,18 +652,9 @@ async def preview_file_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="preview_file",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("preview_file", user_id, path, e)
         logger.error("file_preview_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -466,54 +662,54 @@ async def read_folder_tree_tool(
     context: RunContext,
     path: str,
     depth: int = 3,
+    sort: bool = True,
+    include_ignored: bool = False,
 ) -> dict:
-    """Read folder structure (tree view, no file content)"""
+    """
+    Read folder structure (tree view, no file content)
+
+    Folders such as node_modules, build and venv (IGNORED_DIRS) are listed
+    but not expanded unless include_ignored is set.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        root = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_root = path_validator.validate_path(
-                root,
-                operation="read",
-                must_exist=True
-            )
+            validated_root = await _resolve_read_path(path, "read_folder_tree", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="read_folder_tree",
-                status="blocked",
-                details={"path": str(root)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(root)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_root, must_exist=True)
-
-        tree = []
-
-        def walk(current: Path, level: int):
-            if level > depth:
-                return
-            for item in sorted(current.iterdir()):
-                tree.append({
-                    "path": str(item),
-                    "type": "dir" if item.is_dir() else "file",
-                    "level": level,
-                })
-                if item.is_dir():
-                    walk(item, level + 1)
-
-        walk(validated_root, 0)
+            return ToolResult.error_dict(str(e), prefix="Security: ")
+
+        # (path, is_dir, level) tuples while walking; dicts are only
+        # built once for the result
+        entries_found = []
+        root_str = os.fspath(validated_root)
+        ignored = _ignored_dirs(include_ignored)
+
+        # Sibling folders are scanned concurrently; entries come back
+        # unordered, so the whole tree is sorted once at the end
+        def visit(current: str, entries: list[os.DirEntry]) -> list[str]:
+            level = current[len(root_str):].count(os.sep)
+            subfolders = []
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entries_found.append((entry.path, is_dir, level))
+                # Ignored folders are listed but not expanded
+                if is_dir and level < depth and entry.name not in ignored:
+                    subfolders.append(entry.path)
+            return subfolders
+
+        await asyncio.to_thread(parallel_walk, validated_root, visit)
+        if sort:
+            entries_found.sort(key=lambda item: item[0].split(os.sep))
+
+        tree = [
+            {"path": p, "type": "dir" if is_dir else "file", "level": level}
+            for p, is_dir, level in entries_found
+        ]
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="read_folder_tree",
             status="success",
             details={"depth": depth, "items": len(tree)},
@@ -529,18 +725,9 @@ async def read_folder_tree_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="read_folder_tree",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("read_folder_tree", user_id, path, e)
         logger.error("folder_tree_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -549,58 +736,47 @@ async def search_file_contents_tool(
     path: str,
     query: str,
     case_sensitive: bool = False,
+    max_matches: int | None = None,
+    include_ignored: bool = False,
 ) -> dict:
-    """Search text inside files (grep-style)"""
+    """
+    Search text inside files (grep-style)
+
+    Folders such as node_modules, build and venv (IGNORED_DIRS) are skipped
+    unless include_ignored is set.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        root = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_root = path_validator.validate_path(
-                root,
-                operation="read",
-                must_exist=True
+            validated_root = await _resolve_read_path(
+                path, "search_file_contents", user_id, query=query
             )
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="search_file_contents",
-                status="blocked",
-                details={"path": str(root), "query": query},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(root)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_root, must_exist=True)
+            return ToolResult.error_dict(str(e), prefix="Security: ")
 
+        contains = _make_matcher(query, case_sensitive)
+        # Files shorter than the encoded needle can't match. Lowercasing can
+        # change the byte length of non-ASCII text, so no bound there.
+        if case_sensitive or query.isascii():
+            min_size = len(query.encode("utf-8"))
+        else:
+            min_size = 0
         matches = []
+        truncated = False
 
-        for file in validated_root.rglob("*"):
-            if not file.is_file():
-                continue
-
-            if file.stat().st_size > MAX_READ_SIZE:
-                continue
-
-            try:
-                text = file.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-
-            haystack = text if case_sensitive else text.lower()
-            needle = query if case_sensitive else query.lower()
-
-            if needle in haystack:
-                matches.append(str(file))
+        async with aclosing(_iter_matches(
+            validated_root, contains, min_size, _ignored_dirs(include_ignored)
+        )) as found:
+            async for match in found:
+                matches.append(match)
+                if max_matches and len(matches) >= max_matches:
+                    truncated = True
+                    break
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="search_file_contents",
             status="success",
             details={"query": query, "matches": len(matches)},
@@ -611,23 +787,19 @@ async def search_file_contents_tool(
 
         return ToolResult(
             success=True,
-            data={"query": query, "matches": matches, "count": len(matches)},
+            data={
+                "query": query,
+                "matches": matches,
+                "count": len(matches),
+                "truncated": truncated,
+            },
             message=f"Found matches in {len(matches)} files",
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="search_file_contents",
-            status="failed",
-            details={"path": str(path), "query": query},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("search_file_contents", user_id, path, e, query=query)
         logger.error("content_search_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return ToolResult.error_dict(str(e))
 
 
 @function_tool()
@@ -639,48 +811,32 @@ async def detect_project_type_tool(
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        root = expand_user_path(path)
-
         # Week 2: Security validation
         try:
-            validated_root = path_validator.validate_path(
-                root,
-                operation="read",
-                must_exist=True
-            )
+            validated_root = await _resolve_read_path(path, "detect_project_type", user_id)
         except (PathSecurityError, ValidationError) as e:
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="detect_project_type",
-                status="blocked",
-                details={"path": str(root)},
-                user_id=user_id,
-                risk_level="blocked",
-                paths=[str(root)],
-                error=str(e)
-            )
-            return ToolResult(success=False, error=f"Security: {str(e)}").to_dict()
-
-        validate_path(validated_root, must_exist=True)
-
-        files = {f.name.lower() for f in validated_root.iterdir() if f.is_file()}
-
-        project_type = "unknown"
-
-        if "package.json" in files and "next.config.js" in files:
-            project_type = "nextjs"
-        elif "package.json" in files:
-            project_type = "nodejs"
-        elif "requirements.txt" in files or "pyproject.toml" in files:
-            project_type = "python"
-        elif "environment.yml" in files:
-            project_type = "conda_ml"
-        elif "dockerfile" in files:
-            project_type = "dockerized_app"
+            return ToolResult.error_dict(str(e), prefix="Security: ")
+
+        # Only signature names matter; stop once all of them are found
+        files = set()
+        with os.scandir(validated_root) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if name in PROJECT_SIGNATURES and entry.is_file():
+                    files.add(name)
+                    if len(files) == len(PROJECT_SIGNATURES):
+                        break
+
+        project_type = next(
+            (
+                kind for kind, rule, names in PROJECT_MARKERS
+                if (names <= files if rule == "all" else not names.isdisjoint(files))
+            ),
+            "unknown",
+        )
 
         # Week 2: Enhanced audit log
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="detect_project_type",
             status="success",
             details={"project_type": project_type},
@@ -696,15 +852,6 @@ async def detect_project_type_tool(
         ).to_dict()
 
     except Exception as e:
-        audit = AuditLogger()
-        await audit.log_operation(
-            operation_type="detect_project_type",
-            status="failed",
-            details={"path": str(path)},
-            user_id=user_id,
-            risk_level="unknown",
-            paths=[str(path)],
-            error=str(e)
-        )
+        await _audit_failure("detect_project_type", user_id, path, e)
         logger.error("project_detection_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
\ No newline at end of file
+        return ToolResult.error_dict(str(e))
\ No newline at end of file
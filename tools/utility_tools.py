@@ -1,45 +1,297 @@
+import asyncio
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from config.settings import settings
 from utils.logger import get_logger
 from core.snapshot import SnapshotManager
-from core.audit_logger import AuditLogger
+from core.audit_logger import audit_logger
 from models.tool_results import ToolResult
 from livekit.agents import function_tool, RunContext
 
 logger = get_logger(__name__)
 
-# Global state management
-_last_snapshot_id = None
-_last_undone_snapshot_id = None
-_active_transaction = None
-_snapshot_stack = []  # Stack for multiple undo operations
+MAX_UNDO_STACK = 10  # Snapshots kept for multi-level undo
+HISTORY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# datetime.fromisoformat parses a trailing "Z" itself from Python 3.11
+ISO_PARSES_Z = sys.version_info >= (3, 11)
+
+# Fixed failure results, copied on return
+_NO_UNDO_RESULT = ToolResult.error_dict("No recent action to undo. No operations have been performed yet.")
+_NO_REDO_RESULT = ToolResult.error_dict("No undone action available to redo")
+_NO_SNAPSHOT_ID_RESULT = ToolResult.error_dict("No snapshot ID given")
+_NO_TRANSACTION_RESULT = ToolResult.error_dict("No active transaction to end")
+_NO_PEEK_RESULT = ToolResult.error_dict("No undoable action available")
+
+# Static fields of a successful result; _ok merges data and message into it
+# instead of building a ToolResult each time
+_STATUS_OK = ToolResult(success=True).to_dict()
+
+
+def _ok(data: dict, message: str) -> dict:
+    """Success result, same shape as ToolResult(success=True, ...).to_dict()"""
+    return {**_STATUS_OK, "data": data, "message": message}
+
+
+def _err(error: str) -> dict:
+    """Failure result, same shape as ToolResult(success=False, ...).to_dict()"""
+    return ToolResult.error_dict(error)
+
+
+@dataclass(slots=True)
+class UtilityState:
+    """
+    Undo/redo and transaction tracking shared by the utility tools
+
+    Kept process-wide on purpose: each agent session runs in its own job
+    process, and every tool call runs in a task of its own, so a ContextVar
+    set by begin_transaction_tool would never be seen by the later
+    end_transaction_tool call.
+    """
+    last_snapshot_id: Optional[str] = None
+    last_undone_snapshot_id: Optional[str] = None
+    active_transaction: Optional[str] = None
+    # Stack for multiple undo operations, with a set mirroring it for O(1)
+    # membership checks
+    snapshot_stack: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_UNDO_STACK))
+    snapshot_set: Set[str] = field(default_factory=set)
+    # On-disk bytes of each stack entry's snapshots, and their running total
+    snapshot_sizes: Dict[str, int] = field(default_factory=dict)
+    total_bytes: int = 0
+    # Snapshots recorded while a transaction is open; they reach the stack as
+    # one entry when it ends
+    transaction_snapshots: List[str] = field(default_factory=list)
+    transaction_bytes: int = 0
+    # Stack entries standing for a whole transaction -> its snapshots, oldest first
+    transaction_groups: Dict[str, List[str]] = field(default_factory=dict)
+    # (operation_type, created_at, file_count) of stack entries, so peek and
+    # list don't re-read snapshot files; entries leave with their stack slot
+    snapshot_meta: Dict[str, Tuple[str, str, int]] = field(default_factory=dict)
+
+
+# Global instances
+_state = UtilityState()
+# Serializes undo/redo/transaction state changes, rollbacks included, so
+# two concurrent undos can't roll back and pop the same snapshot. Audit
+# entries, logging and result building stay outside it.
+_state_lock = asyncio.Lock()
+snapshot_mgr = SnapshotManager()
+
+
+def _drop_oldest_snapshot(state: UtilityState):
+    """Evict the oldest undo stack entry and everything tracked for it"""
+    snapshot_id = state.snapshot_stack.popleft()
+    state.snapshot_set.discard(snapshot_id)
+    state.transaction_groups.pop(snapshot_id, None)
+    state.snapshot_meta.pop(snapshot_id, None)
+    state.total_bytes -= state.snapshot_sizes.pop(snapshot_id, 0)
+
+
+def _forget_snapshot(state: UtilityState, snapshot_id: str):
+    """Remove an undone entry from the stack and its bookkeeping"""
+    if snapshot_id in state.snapshot_set:
+        stack = state.snapshot_stack
+        # Undo takes the newest entry, so pop it in O(1); only an entry
+        # further down needs the O(n) remove
+        if stack[-1] == snapshot_id:
+            stack.pop()
+        else:
+            stack.remove(snapshot_id)
+        state.snapshot_set.discard(snapshot_id)
+    state.transaction_groups.pop(snapshot_id, None)
+    state.snapshot_meta.pop(snapshot_id, None)
+    state.total_bytes -= state.snapshot_sizes.pop(snapshot_id, 0)
+
+
+def set_last_snapshot(snapshot_id: str, size_bytes: int = 0):
+    """
+    Set the last snapshot ID and add to stack
+
+    Inside a transaction the snapshot is held back instead, so the whole
+    transaction takes a single stack slot and is undone in one step.
+
+    Args:
+        snapshot_id: Snapshot to track
+        size_bytes: On-disk size of the snapshot (Snapshot.size_bytes),
+            counted against MAX_UNDO_STACK_MB
+    """
+    state = _state
+    if state.active_transaction:
+        pending = state.transaction_snapshots
+        if snapshot_id and (not pending or pending[-1] != snapshot_id):
+            pending.append(snapshot_id)
+            state.transaction_bytes += size_bytes
+        logger.debug(
+            "snapshot_deferred",
+            extra={"snapshot_id": snapshot_id, "transaction": state.active_transaction}
+        )
+        return
 
+    # Repeated calls for the current snapshot (retries) change nothing
+    if snapshot_id == state.last_snapshot_id:
+        return
 
-def set_last_snapshot(snapshot_id: str):
-    """Set the last snapshot ID and add to stack"""
-    global _last_snapshot_id, _snapshot_stack
-    _last_snapshot_id = snapshot_id
+    state.last_snapshot_id = snapshot_id
     
     # Add to stack for multi-level undo
-    if snapshot_id and snapshot_id not in _snapshot_stack:
-        _snapshot_stack.append(snapshot_id)
-        # Keep only last 10 snapshots
-        if len(_snapshot_stack) > 10:
-            _snapshot_stack.pop(0)
+    stack = state.snapshot_stack
+    if snapshot_id and snapshot_id not in state.snapshot_set:
+        # Keep only the last MAX_UNDO_STACK snapshots; evict explicitly so
+        # the set and sizes stay in step with the deque
+        if len(stack) == stack.maxlen:
+            _drop_oldest_snapshot(state)
+        stack.append(snapshot_id)
+        state.snapshot_set.add(snapshot_id)
+        state.snapshot_sizes[snapshot_id] = size_bytes
+        state.total_bytes += size_bytes
+
+        # Then trim by size, always keeping the newest entry
+        max_bytes = settings.MAX_UNDO_STACK_MB * 1024 * 1024
+        while state.total_bytes > max_bytes and len(stack) > 1:
+            _drop_oldest_snapshot(state)
+    
+    logger.debug("snapshot_tracked", extra={"snapshot_id": snapshot_id, "stack_size": len(stack)})
+
+
+async def _rollback_entry(snapshot_id: str) -> dict:
+    """
+    Roll back one undo stack entry
+
+    A transaction entry rolls back each of its snapshots, newest first, and
+    stops at the first failure. The result has the same shape as
+    SnapshotManager.rollback, with the restored counts summed.
+    """
+    snapshot_ids = _state.transaction_groups.get(snapshot_id)
+    if snapshot_ids is None:
+        return await snapshot_mgr.rollback(snapshot_id)
+
+    restored = 0
+    result = {}
+    for member_id in reversed(snapshot_ids):
+        result = await snapshot_mgr.rollback(member_id)
+        restored += result.get("restored", 0)
+        if not result.get("success"):
+            break
+    return {**result, "restored": restored}
+
+
+async def _get_snapshot_meta(snapshot_id: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Get (operation_type, created_at, file_count) for a snapshot, loading it
+    only on a cache miss
+
+    Snapshots never change once written, so an entry stays valid until its
+    snapshot leaves the undo stack. Snapshots not on the stack aren't cached.
+    """
+    state = _state
+    meta = state.snapshot_meta.get(snapshot_id)
+    if meta is not None:
+        return meta
+
+    snapshot = await snapshot_mgr.load_snapshot(snapshot_id)
+    if not snapshot:
+        return None
+
+    meta = (snapshot.operation_type, snapshot.created_at, len(snapshot.file_states))
+    if snapshot_id in state.snapshot_set:
+        state.snapshot_meta[snapshot_id] = meta
+    return meta
+
+
+@lru_cache(maxsize=2048)
+def _format_timestamp(timestamp: str) -> str:
+    """
+    Format an audit ISO timestamp for display, or return it unchanged if it
+    doesn't parse
+
+    Cached because repeated history calls mostly re-show the same rows.
+    """
+    parsed = timestamp
+    if not ISO_PARSES_Z and parsed.endswith('Z'):
+        parsed = parsed[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(parsed).strftime(HISTORY_TIME_FORMAT)
+    except ValueError:
+        return timestamp
+
+
+def _format_history_entry(op: dict) -> dict:
+    """Shape one audit record for show_history_tool"""
+    details = op.get("details") or {}
+    if isinstance(details, str):
+        # SQLite rows keep details as JSON text
+        try:
+            details = json.loads(details)
+        except ValueError:
+            details = {}
+    
+    # Format timestamp
+    timestamp = op.get("timestamp", "")
+    formatted_time = _format_timestamp(timestamp) if timestamp else "Unknown time"
+    
+    # Build summary
+    op_type = op.get("operation_type", "unknown")
+    status = op.get("status", "unknown")
     
-    logger.info("snapshot_tracked", extra={"snapshot_id": snapshot_id, "stack_size": len(_snapshot_stack)})
+    summary = f"{op_type} - {status}"
+    if "count" in details:
+        summary += f" ({details['count']} items)"
+    elif "moved" in details:
+        summary += f" ({details['moved']} items)"
+    
+    return {
+        "time": formatted_time,
+        "operation": op_type,
+        "status": status,
+        "summary": summary,
+        "details": details
+    }
 
 
 @function_tool()
 async def undo_last_action_tool(context: RunContext) -> dict:
-    """Undo the last file operation with full rollback capability"""
+    """
+    Undo the last file operation with full rollback capability
+
+    Audit entries are queued for the background writer, so the result
+    returns as soon as the rollback is done.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
+    state = _state
+    snapshot_id = None
     
     try:
-        global _last_snapshot_id, _last_undone_snapshot_id, _snapshot_stack
-
-        if not _last_snapshot_id:
+        # Only the rollback and the stack update it commits are locked;
+        # audit and logging happen after release
+        async with _state_lock:
+            # Read the target once: set_last_snapshot may move the state on
+            # while the rollback is awaited
+            snapshot_id = state.last_snapshot_id
+            if snapshot_id:
+                logger.info("undo_attempt", extra={"snapshot_id": snapshot_id})
+
+                # Perform rollback
+                result = await _rollback_entry(snapshot_id)
+
+                if result.get("success"):
+                    # Update state
+                    state.last_undone_snapshot_id = snapshot_id
+                
+                    # Remove from stack
+                    _forget_snapshot(state, snapshot_id)
+                
+                    # Set to previous snapshot if available
+                    state.last_snapshot_id = state.snapshot_stack[-1] if state.snapshot_stack else None
+                    remaining_undos = len(state.snapshot_stack)
+
+        if not snapshot_id:
             # Week 2: Enhanced audit
-            audit = AuditLogger()
-            await audit.log_operation(
+            audit_logger.log_operation_nowait(
                 operation_type="undo",
                 status="failed",
                 details={"reason": "no_snapshot"},
@@ -48,27 +300,18 @@ async def undo_last_action_tool(context: RunContext) -> dict:
                 paths=[],
                 error="No recent action to undo"
             )
-            return ToolResult(
-                success=False,
-                error="No recent action to undo. No operations have been performed yet."
-            ).to_dict()
-
-        logger.info("undo_attempt", extra={"snapshot_id": _last_snapshot_id})
-
-        snapshot_mgr = SnapshotManager()
-        
-        # Perform rollback
-        result = await snapshot_mgr.rollback(_last_snapshot_id)
+            return dict(_NO_UNDO_RESULT)
 
         if result.get("success"):
+            restored_count = result.get("restored", 0)
+
             # Week 2: Enhanced audit log
-            audit = AuditLogger()
-            await audit.log_operation(
+            audit_logger.log_operation_nowait(
                 operation_type="undo",
                 status="success",
                 details={
-                    "snapshot_id": _last_snapshot_id,
-                    "restored": result.get("restored", 0),
+                    "snapshot_id": snapshot_id,
+                    "restored": restored_count,
                     "operation": result.get("operation_type", "unknown")
                 },
                 user_id=user_id,
@@ -79,64 +322,46 @@ async def undo_last_action_tool(context: RunContext) -> dict:
             logger.info(
                 "undo_successful",
                 extra={
-                    "snapshot_id": _last_snapshot_id,
-                    "restored": result.get("restored", 0)
+                    "snapshot_id": snapshot_id,
+                    "restored": restored_count
                 }
             )
 
-            # Update state
-            _last_undone_snapshot_id = _last_snapshot_id
-            
-            # Remove from stack
-            if _last_snapshot_id in _snapshot_stack:
-                _snapshot_stack.remove(_last_snapshot_id)
-            
-            # Set to previous snapshot if available
-            _last_snapshot_id = _snapshot_stack[-1] if _snapshot_stack else None
-
             # Build detailed message
-            restored_count = result.get("restored", 0)
             operation_type = result.get("operation_type", "operation")
-            
+        
             message = f"✅ Undone! Restored {restored_count} item(s) from {operation_type}"
-            
-            return ToolResult(
-                success=True,
+        
+            return _ok(
                 data={
                     "restored": restored_count,
                     "operation_type": operation_type,
-                    "snapshot_id": _last_undone_snapshot_id,
-                    "remaining_undos": len(_snapshot_stack)
+                    "snapshot_id": snapshot_id,
+                    "remaining_undos": remaining_undos
                 },
                 message=message
-            ).to_dict()
-        
-        else:
-            error_msg = result.get("error", "Rollback failed for unknown reason")
-            
-            # Week 2: Enhanced audit
-            audit = AuditLogger()
-            await audit.log_operation(
-                operation_type="undo",
-                status="failed",
-                details={"snapshot_id": _last_snapshot_id},
-                user_id=user_id,
-                risk_level="low",
-                paths=[],
-                error=error_msg
             )
-            
-            logger.error("undo_failed", extra={"error": error_msg, "snapshot_id": _last_snapshot_id})
-            
-            return ToolResult(
-                success=False,
-                error=f"Undo failed: {error_msg}"
-            ).to_dict()
+    
+        error_msg = result.get("error", "Rollback failed for unknown reason")
+    
+        # Week 2: Enhanced audit
+        audit_logger.log_operation_nowait(
+            operation_type="undo",
+            status="failed",
+            details={"snapshot_id": snapshot_id},
+            user_id=user_id,
+            risk_level="low",
+            paths=[],
+            error=error_msg
+        )
+    
+        logger.error("undo_failed", extra={"error": error_msg, "snapshot_id": snapshot_id})
+    
+        return _err(f"Undo failed: {error_msg}")
 
     except Exception as e:
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="undo",
             status="failed",
             details={},
@@ -145,11 +370,9 @@ async def undo_last_action_tool(context: RunContext) -> dict:
             paths=[],
             error=str(e)
         )
-        logger.error("undo_exception", extra={"error": str(e)}, exc_info=True)
-        return ToolResult(
-            success=False,
-            error=f"Undo failed with error: {str(e)}"
-        ).to_dict()
+        # Tracebacks only in debug mode; formatting one is costly
+        logger.error("undo_exception", extra={"error": str(e)}, exc_info=settings.DEBUG)
+        return _err(f"Undo failed with error: {str(e)}")
 
 
 @function_tool()
@@ -158,12 +381,11 @@ async def show_history_tool(context: RunContext, limit: int = 10) -> dict:
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        audit = AuditLogger()
-        operations = await audit.get_recent_operations(limit)
+        operations = await audit_logger.get_recent_operations(limit)
 
         if not operations:
             # Week 2: Enhanced audit
-            await audit.log_operation(
+            audit_logger.log_operation_nowait(
                 operation_type="show_history",
                 status="success",
                 details={"count": 0},
@@ -171,49 +393,13 @@ async def show_history_tool(context: RunContext, limit: int = 10) -> dict:
                 risk_level="safe",
                 paths=[]
             )
-            return ToolResult(
-                success=True,
-                data={"operations": []},
-                message="No operations in history yet"
-            ).to_dict()
+            return _ok({"operations": []}, "No operations in history yet")
 
         # Enhanced history with better formatting
-        history = []
-        for op in operations:
-            details = op.get("details", {})
-            
-            # Format timestamp
-            timestamp = op.get("timestamp", "")
-            if timestamp:
-                from datetime import datetime
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except:
-                    formatted_time = timestamp
-            else:
-                formatted_time = "Unknown time"
-            
-            # Build summary
-            op_type = op.get("operation_type", "unknown")
-            status = op.get("status", "unknown")
-            
-            summary = f"{op_type} - {status}"
-            if "count" in details:
-                summary += f" ({details['count']} items)"
-            elif "moved" in details:
-                summary += f" ({details['moved']} items)"
-            
-            history.append({
-                "time": formatted_time,
-                "operation": op_type,
-                "status": status,
-                "summary": summary,
-                "details": details
-            })
+        history = [_format_history_entry(op) for op in operations]
 
         # Week 2: Enhanced audit
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="show_history",
             status="success",
             details={"count": len(history), "limit": limit},
@@ -224,16 +410,14 @@ async def show_history_tool(context: RunContext, limit: int = 10) -> dict:
 
         logger.info("history_retrieved", extra={"count": len(history)})
 
-        return ToolResult(
-            success=True,
+        return _ok(
             data={"operations": history, "total": len(history)},
             message=f"Showing last {len(history)} operations"
-        ).to_dict()
+        )
 
     except Exception as e:
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="show_history",
             status="failed",
             details={},
@@ -243,50 +427,43 @@ async def show_history_tool(context: RunContext, limit: int = 10) -> dict:
             error=str(e)
         )
         logger.error("history_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return _err(str(e))
 
 
 @function_tool()
 async def redo_last_action_tool(context: RunContext) -> dict:
     """Redo the last undone action"""
     user_id = getattr(context, 'user_id', 'default_user')
-    
-    try:
-        global _last_undone_snapshot_id, _last_snapshot_id
-
-        if not _last_undone_snapshot_id:
-            return ToolResult(
-                success=False,
-                error="No undone action available to redo"
-            ).to_dict()
+    state = _state
 
+    try:
         # Restore the undone snapshot as current
-        _last_snapshot_id = _last_undone_snapshot_id
-        _last_undone_snapshot_id = None
+        async with _state_lock:
+            snapshot_id = state.last_undone_snapshot_id
+            if snapshot_id:
+                state.last_snapshot_id = snapshot_id
+                state.last_undone_snapshot_id = None
+
+        if not snapshot_id:
+            return dict(_NO_REDO_RESULT)
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="redo",
             status="success",
-            details={"snapshot_id": _last_snapshot_id},
+            details={"snapshot_id": snapshot_id},
             user_id=user_id,
             risk_level="low",
             paths=[]
         )
 
-        logger.info("redo_executed", extra={"snapshot_id": _last_snapshot_id})
+        logger.info("redo_executed", extra={"snapshot_id": snapshot_id})
 
-        return ToolResult(
-            success=True,
-            data={"snapshot_id": _last_snapshot_id},
-            message="Redo completed - action restored"
-        ).to_dict()
+        return _ok({"snapshot_id": snapshot_id}, "Redo completed - action restored")
 
     except Exception as e:
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="redo",
             status="failed",
             details={},
@@ -296,55 +473,68 @@ async def redo_last_action_tool(context: RunContext) -> dict:
             error=str(e)
         )
         logger.error("redo_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return _err(str(e))
 
 
 @function_tool()
 async def undo_to_snapshot_tool(context: RunContext, snapshot_id: str) -> dict:
-    """Undo to a specific snapshot ID (advanced rollback)"""
+    """
+    Undo to a specific snapshot ID (advanced rollback)
+
+    Returns without touching the snapshot store when no ID is given, or when
+    the snapshot is the one the last undo already rolled back.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
-    
+
+    if not snapshot_id:
+        return dict(_NO_SNAPSHOT_ID_RESULT)
+
     try:
-        logger.info("undo_to_snapshot_attempt", extra={"target_snapshot": snapshot_id})
+        async with _state_lock:
+            if snapshot_id == _state.last_undone_snapshot_id:
+                return _ok(
+                    data={"snapshot_id": snapshot_id, "restored": 0},
+                    message=f"Snapshot {snapshot_id[:8]}... is already rolled back"
+                )
+
+            logger.info("undo_to_snapshot_attempt", extra={"target_snapshot": snapshot_id})
         
-        snapshot_mgr = SnapshotManager()
-        result = await snapshot_mgr.rollback(snapshot_id)
+            result = await snapshot_mgr.rollback(snapshot_id)
+
+            if result.get("success"):
+                _state.last_snapshot_id = None
 
         if result.get("success"):
-            global _last_snapshot_id
-            _last_snapshot_id = None
-            
+            restored = result.get("restored", 0)
+        
             # Week 2: Enhanced audit
-            audit = AuditLogger()
-            await audit.log_operation(
+            audit_logger.log_operation_nowait(
                 operation_type="undo_to_snapshot",
                 status="success",
-                details={"snapshot_id": snapshot_id, "restored": result.get("restored", 0)},
+                details={"snapshot_id": snapshot_id, "restored": restored},
                 user_id=user_id,
                 risk_level="low",
                 paths=[]
             )
-            
+        
             logger.info(
                 "undo_to_snapshot_successful",
                 extra={
                     "snapshot_id": snapshot_id,
-                    "restored": result.get("restored", 0)
+                    "restored": restored
                 }
             )
 
-            return ToolResult(
-                success=True,
+            return _ok(
                 data={
                     "snapshot_id": snapshot_id,
-                    "restored": result.get("restored", 0)
+                    "restored": restored
                 },
                 message=f"Rolled back to snapshot {snapshot_id[:8]}..."
-            ).to_dict()
+            )
 
         # Week 2: Enhanced audit for failure
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="undo_to_snapshot",
             status="failed",
             details={"snapshot_id": snapshot_id},
@@ -354,15 +544,11 @@ async def undo_to_snapshot_tool(context: RunContext, snapshot_id: str) -> dict:
             error=result.get("error", "Rollback failed")
         )
 
-        return ToolResult(
-            success=False,
-            error=result.get("error", "Rollback to snapshot failed")
-        ).to_dict()
+        return _err(result.get("error", "Rollback to snapshot failed"))
 
     except Exception as e:
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="undo_to_snapshot",
             status="failed",
             details={"snapshot_id": snapshot_id},
@@ -372,7 +558,7 @@ async def undo_to_snapshot_tool(context: RunContext, snapshot_id: str) -> dict:
             error=str(e)
         )
         logger.error("undo_to_snapshot_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return _err(str(e))
 
 
 @function_tool()
@@ -381,38 +567,35 @@ async def list_available_snapshots_tool(context: RunContext) -> dict:
     user_id = getattr(context, 'user_id', 'default_user')
     
     try:
-        global _snapshot_stack
-        
-        if not _snapshot_stack:
-            return ToolResult(
-                success=True,
-                data={"snapshots": []},
-                message="No snapshots available"
-            ).to_dict()
-
-        snapshot_mgr = SnapshotManager()
+        if not _state.snapshot_stack:
+            return _ok({"snapshots": []}, "No snapshots available")
+
+        # Load every tracked snapshot at once rather than one after another
+        snapshot_ids = list(_state.snapshot_stack)
+        metas = await asyncio.gather(
+            *(_get_snapshot_meta(snapshot_id) for snapshot_id in snapshot_ids),
+            return_exceptions=True
+        )
+
         snapshot_details = []
-        
-        for snapshot_id in _snapshot_stack:
-            try:
-                snapshot = await snapshot_mgr.load_snapshot(snapshot_id)
-                if snapshot:
-                    snapshot_details.append({
-                        "id": snapshot_id,
-                        "operation": snapshot.operation_type,
-                        "created": snapshot.created_at,
-                        "files": len(snapshot.file_states)
-                    })
-            except:
+        for snapshot_id, meta in zip(snapshot_ids, metas):
+            if isinstance(meta, Exception):
                 snapshot_details.append({
                     "id": snapshot_id,
                     "operation": "unknown",
                     "status": "unavailable"
                 })
+            elif meta:
+                operation_type, created_at, file_count = meta
+                snapshot_details.append({
+                    "id": snapshot_id,
+                    "operation": operation_type,
+                    "created": created_at,
+                    "files": file_count
+                })
 
         # Week 2: Enhanced audit
-        audit = AuditLogger()
-        await audit.log_operation(
+        audit_logger.log_operation_nowait(
             operation_type="list_snapshots",
             status="success",
             details={"count": len(snapshot_details)},
@@ -423,37 +606,34 @@ async def list_available_snapshots_tool(context: RunContext) -> dict:
 
         logger.info("snapshots_listed", extra={"count": len(snapshot_details)})
 
-        return ToolResult(
-            success=True,
+        return _ok(
             data={
                 "snapshots": snapshot_details,
                 "total": len(snapshot_details)
             },
             message=f"Found {len(snapshot_details)} available snapshots"
-        ).to_dict()
+        )
 
     except Exception as e:
         logger.error("list_snapshots_failed", extra={"error": str(e)})
-        return ToolResult(success=False, error=str(e)).to_dict()
+        return _err(str(e))
 
 
 @function_tool()
 async def begin_transaction_tool(context: RunContext, name: str) -> dict:
     """Begin a logical transaction for grouped file operations"""
     user_id = getattr(context, 'user_id', 'default_user')
-    global _active_transaction
 
-    if _active_transaction:
-        return ToolResult(
-            success=False,
-            error=f"Transaction '{_active_transaction}' is already active. End it first."
-        ).to_dict()
+    async with _state_lock:
+        active = _state.active_transaction
+        if not active:
+            _state.active_transaction = name
 
-    _active_transaction = name
+    if active:
+        return _err(f"Transaction '{active}' is already active. End it first.")
     
     # Week 2: Enhanced audit
-    audit = AuditLogger()
-    await audit.log_operation(
+    audit_logger.log_operation_nowait(
         operation_type="begin_transaction",
         status="success",
         details={"transaction_name": name},
@@ -464,66 +644,77 @@ async def begin_transaction_tool(context: RunContext, name: str) -> dict:
     
     logger.info("transaction_started", extra={"name": name})
 
-    return ToolResult(
-        success=True,
-        data={"transaction_name": name},
-        message=f"Transaction '{name}' started"
-    ).to_dict()
+    return _ok({"transaction_name": name}, f"Transaction '{name}' started")
 
 
 @function_tool()
 async def end_transaction_tool(context: RunContext) -> dict:
     """End the active transaction"""
     user_id = getattr(context, 'user_id', 'default_user')
-    global _active_transaction
 
-    if not _active_transaction:
-        return ToolResult(
-            success=False,
-            error="No active transaction to end"
-        ).to_dict()
+    async with _state_lock:
+        state = _state
+
+        if not state.active_transaction:
+            return dict(_NO_TRANSACTION_RESULT)
 
-    name = _active_transaction
-    _active_transaction = None
+        name = state.active_transaction
+        state.active_transaction = None
+
+        # Push the transaction's snapshots as one undo entry, keyed by the last
+        snapshot_ids = state.transaction_snapshots
+        size_bytes = state.transaction_bytes
+        state.transaction_snapshots = []
+        state.transaction_bytes = 0
+        if snapshot_ids:
+            if len(snapshot_ids) > 1:
+                state.transaction_groups[snapshot_ids[-1]] = snapshot_ids
+            set_last_snapshot(snapshot_ids[-1], size_bytes)
     
     # Week 2: Enhanced audit
-    audit = AuditLogger()
-    await audit.log_operation(
+    audit_logger.log_operation_nowait(
         operation_type="end_transaction",
         status="success",
-        details={"transaction_name": name},
+        details={"transaction_name": name, "snapshots": len(snapshot_ids)},
         user_id=user_id,
         risk_level="safe",
         paths=[]
     )
     
-    logger.info("transaction_ended", extra={"name": name})
+    logger.info("transaction_ended", extra={"name": name, "snapshots": len(snapshot_ids)})
 
-    return ToolResult(
-        success=True,
-        data={"transaction_name": name},
+    return _ok(
+        data={"transaction_name": name, "snapshots": len(snapshot_ids)},
         message=f"Transaction '{name}' ended successfully"
-    ).to_dict()
+    )
 
 
 @function_tool()
 async def clear_undo_state_tool(context: RunContext) -> dict:
     """Clear all undo/redo state and snapshot tracking"""
     user_id = getattr(context, 'user_id', 'default_user')
-    global _last_snapshot_id, _last_undone_snapshot_id, _snapshot_stack
 
-    previous_state = {
-        "snapshots_cleared": len(_snapshot_stack),
-        "undo_was_available": _last_snapshot_id is not None
-    }
-
-    _last_snapshot_id = None
-    _last_undone_snapshot_id = None
-    _snapshot_stack = []
+    async with _state_lock:
+        state = _state
+
+        previous_state = {
+            "snapshots_cleared": len(state.snapshot_stack),
+            "undo_was_available": state.last_snapshot_id is not None
+        }
+
+        state.last_snapshot_id = None
+        state.last_undone_snapshot_id = None
+        state.snapshot_stack.clear()
+        state.snapshot_set.clear()
+        state.transaction_snapshots.clear()
+        state.transaction_groups.clear()
+        state.snapshot_sizes.clear()
+        state.snapshot_meta.clear()
+        state.total_bytes = 0
+        state.transaction_bytes = 0
     
     # Week 2: Enhanced audit
-    audit = AuditLogger()
-    await audit.log_operation(
+    audit_logger.log_operation_nowait(
         operation_type="clear_undo_state",
         status="success",
         details=previous_state,
@@ -534,71 +725,67 @@ async def clear_undo_state_tool(context: RunContext) -> dict:
     
     logger.info("undo_state_cleared", extra=previous_state)
 
-    return ToolResult(
-        success=True,
+    return _ok(
         data=previous_state,
         message=f"Cleared {previous_state['snapshots_cleared']} snapshots from tracking"
-    ).to_dict()
+    )
 
 
 @function_tool()
 async def peek_last_action_tool(context: RunContext) -> dict:
     """Preview the last undoable action without executing undo"""
     user_id = getattr(context, 'user_id', 'default_user')
-    global _last_snapshot_id
-    
-    if not _last_snapshot_id:
-        return ToolResult(
-            success=False,
-            error="No undoable action available"
-        ).to_dict()
+    snapshot_id = _state.last_snapshot_id
+    if not snapshot_id:
+        return dict(_NO_PEEK_RESULT)
 
     try:
-        snapshot_mgr = SnapshotManager()
-        snapshot = await snapshot_mgr.load_snapshot(_last_snapshot_id)
+        meta = await _get_snapshot_meta(snapshot_id)
         
-        if snapshot:
+        if meta:
+            operation_type, created_at, file_count = meta
             preview = {
-                "snapshot_id": _last_snapshot_id,
-                "operation_type": snapshot.operation_type,
-                "file_count": len(snapshot.file_states),
-                "created_at": snapshot.created_at,
+                "snapshot_id": snapshot_id,
+                "operation_type": operation_type,
+                "file_count": file_count,
+                "created_at": created_at,
                 "can_undo": True
             }
             
-            return ToolResult(
-                success=True,
+            return _ok(
                 data=preview,
-                message=f"Last action: {snapshot.operation_type} affecting {len(snapshot.file_states)} files"
-            ).to_dict()
+                message=f"Last action: {operation_type} affecting {file_count} files"
+            )
     except:
         pass
 
-    return ToolResult(
-        success=True,
-        data={"snapshot_id": _last_snapshot_id, "can_undo": True},
+    return _ok(
+        data={"snapshot_id": snapshot_id, "can_undo": True},
         message="Undoable action is available"
-    ).to_dict()
+    )
 
 
 @function_tool()
 async def system_state_tool(context: RunContext) -> dict:
-    """Inspect overall system state"""
+    """
+    Inspect overall system state
+
+    Agents may poll this every turn, so nothing here waits on I/O.
+    """
     user_id = getattr(context, 'user_id', 'default_user')
-    global _last_snapshot_id, _last_undone_snapshot_id, _active_transaction, _snapshot_stack
-    
+    current = _state
     state = {
-        "undo_available": _last_snapshot_id is not None,
-        "redo_available": _last_undone_snapshot_id is not None,
-        "transaction_active": _active_transaction is not None,
-        "snapshot_count": len(_snapshot_stack),
-        "current_snapshot": _last_snapshot_id,
-        "transaction_name": _active_transaction
+        "undo_available": current.last_snapshot_id is not None,
+        "redo_available": current.last_undone_snapshot_id is not None,
+        "transaction_active": current.active_transaction is not None,
+        "snapshot_count": len(current.snapshot_stack),
+        "transaction_snapshots": len(current.transaction_snapshots),
+        "current_snapshot": current.last_snapshot_id,
+        "transaction_name": current.active_transaction
     }
     
     # Week 2: Enhanced audit
-    audit = AuditLogger()
-    await audit.log_operation(
+    audit_logger.log_operation_nowait(
         operation_type="system_state",
         status="success",
         details=state,
@@ -607,10 +794,6 @@ async def system_state_tool(context: RunContext) -> dict:
         paths=[]
     )
     
-    logger.info("system_state_retrieved", extra=state)
+    logger.debug("system_state_retrieved", extra={"snapshot_count": state["snapshot_count"]})
 
-    return ToolResult(
-        success=True,
-        data=state,
-        message="System state retrieved successfully"
-    ).to_dict()
\ No newline at end of file
+    return _ok(state, "System state retrieved successfully")
\ No newline at end of file
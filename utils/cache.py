@@ -0,0 +1,74 @@
+"""
+Small in-process caches for hot tool paths
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time
+
+    Guarded by a lock so scans running in worker threads can share it.
+    """
+
+    def __init__(self, max_size: int = 128, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value if present and not expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            stored_at, value = item
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Validated paths for the read tools (see tools/read_tools._resolve_read_path).
+# Shared here so tools that move, rename, create or delete files can clear it
+# (through invalidate_path_caches) once they have changed the filesystem.
+read_path_cache = TTLCache(max_size=512, ttl_seconds=2)
+
+# Recent scan results (see utils/file_utils.scan_folder_cached), keyed on
+# (path, recursive, ignored, folder mtime)
+scan_cache = TTLCache(max_size=128, ttl_seconds=60)
+
+
+def invalidate_path_caches() -> None:
+    """
+    Drop cached path validations and scan results
+
+    Call after moving, renaming, creating or deleting files. The folder mtime
+    in the scan key only covers the top level, so a change deeper down would
+    otherwise be served stale to recursive scans until the entry expires.
+    """
+    read_path_cache.clear()
+    scan_cache.clear()
@@ -1,11 +1,43 @@
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterator, Optional
 from dataclasses import dataclass
-from datetime import datetime
 from config.settings import settings
 from config.policies import is_sensitive_file
+from utils.cache import scan_cache
 
-@dataclass
+# Threads used to scan sibling folders during tree walks
+WALK_WORKERS = 8
+
+# Dependency, cache and build folders that searches and tree views skip
+IGNORED_DIRS = frozenset({
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "dist",
+    "build",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".next",
+})
+
+def _build_ext_map(categories: Dict[str, List[str]]) -> Dict[str, str]:
+    """Flatten category -> extensions; the first category listing an extension wins"""
+    ext_map: Dict[str, str] = {}
+    for category, extensions in categories.items():
+        for ext in extensions:
+            ext_map.setdefault(ext, category)
+    return ext_map
+
+# Extension -> category, so categorize_file does one dict lookup instead of
+# scanning every category's extension list
+_EXT_TO_CATEGORY = _build_ext_map(settings.FILE_TYPE_CATEGORIES)
+
+@dataclass(slots=True)
 class FileInfo:
     """File information"""
     path: Path
@@ -23,12 +55,15 @@ class FileInfo:
     @property
     def size_human(self) -> str:
         """Human-readable size"""
-        size = self.size_bytes
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        return humanize_bytes(self.size_bytes)
+
+def humanize_bytes(size: float) -> str:
+    """Format a byte count as a human-readable size"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
 
 def categorize_file(file_path: Path) -> str:
     """
@@ -41,12 +76,13 @@ def categorize_file(file_path: Path) -> str:
         Category name
     """
     ext = file_path.suffix.lower()
-    name = file_path.stem.lower()
     
     # Primary: Extension-based categorization
-    for category, extensions in settings.FILE_TYPE_CATEGORIES.items():
-        if ext in extensions:
-            return category
+    category = _EXT_TO_CATEGORY.get(ext)
+    if category is not None:
+        return category
+    
+    name = file_path.stem.lower()
     
     # Advanced: Name pattern recognition for special files
     if any(keyword in name for keyword in ['readme', 'license', 'changelog', 'contributing', 'authors']):
@@ -77,105 +113,153 @@ def categorize_file(file_path: Path) -> str:
     # Unknown extensions
     return "Other"
 
-def scan_folder(folder: Path, recursive: bool = False) -> List[FileInfo]:
+def calculate_folder_size(
+    folder_path: str,
+    sizes: Optional[Dict[str, tuple[int, int]]] = None,
+    listings: Optional[Dict[str, List[os.DirEntry]]] = None,
+) -> tuple[int, int]:
     """
-    Advanced folder scanning - detects BOTH files AND folders/subfolders
-    
-    Features:
-    - Scans files AND folders at current level
-    - Recursive subdirectory scanning (when enabled)
-    - Automatic hidden file/folder detection
-    - Symlink handling
-    - Permission error handling
-    - Intelligent categorization
-    - Folder size calculation
+    Calculate total size and item count of a folder
     
     Args:
-        folder: Folder to scan
-        recursive: Scan all subdirectories recursively
+        folder_path: Folder to measure
+        sizes: Optional memo shared across calls. Every subfolder measured
+            along the way is stored in it, and a stored folder is returned
+            (and dropped) without walking it again.
+        listings: Optional map of folder path -> its DirEntry list. Folders
+            found in it are not read again, and every folder read is added
+            to it. DirEntry caches its stat result, so a later scan reusing
+            these entries repeats neither the readdir nor the stat calls.
         
     Returns:
-        List of FileInfo objects (both files and folders)
+        (total size in bytes of everything below it, direct item count)
     """
-    items = []  # Will contain both files and folders
+    if sizes is not None and folder_path in sizes:
+        return sizes.pop(folder_path)
     
-    def _calculate_folder_size(folder_path: Path) -> tuple[int, int]:
-        """Calculate total size and item count of a folder"""
-        total_size = 0
-        item_count = 0
-        
+    total_size = 0
+    item_count = 0
+    
+    entries = listings.get(folder_path) if listings is not None else None
+    if entries is None:
         try:
-            for item in folder_path.iterdir():
-                item_count += 1
-                try:
-                    if item.is_file():
-                        total_size += item.stat().st_size
-                    elif item.is_dir():
-                        # Recursively calculate subfolder size
-                        subfolder_size, _ = _calculate_folder_size(item)
-                        total_size += subfolder_size
-                except (OSError, PermissionError):
-                    continue
+            with os.scandir(folder_path) as it:
+                entries = list(it)
         except (OSError, PermissionError):
-            pass
-        
-        return total_size, item_count
+            entries = []
+        if listings is not None:
+            listings[folder_path] = entries
     
-    def _scan_recursive(current_path: Path, collect_folders: bool = True):
-        """Internal recursive scanner with folder detection"""
+    for entry in entries:
+        item_count += 1
         try:
-            dir_items = list(current_path.iterdir())
+            if entry.is_file():
+                total_size += entry.stat().st_size
+            elif entry.is_dir():
+                # Recursively calculate subfolder size
+                subfolder_size, _ = calculate_folder_size(entry.path, sizes, listings)
+                total_size += subfolder_size
         except (OSError, PermissionError):
-            # Skip folders we can't access
-            return
+            continue
+    
+    if sizes is not None:
+        sizes[folder_path] = (total_size, item_count)
+    return total_size, item_count
+
+def scan_folder_iter(
+    folder: Path,
+    recursive: bool = False,
+    ignored: frozenset = frozenset(),
+    listings: Optional[Dict[str, List[os.DirEntry]]] = None,
+) -> Iterator[FileInfo]:
+    """
+    Streaming variant of scan_folder - yields FileInfo objects one at a time
+    
+    Walks the folder with os.scandir so callers that only bucket or count
+    items never hold the full result list in memory.
+    
+    Args:
+        folder: Folder to scan
+        recursive: Scan all subdirectories recursively
+        ignored: Folder names to leave out entirely (e.g. IGNORED_DIRS)
+        listings: Folder listings already read (see read_tree); recursive
+            scans take folders from it instead of reading them again.
+            Entries are removed as they are used.
         
-        for item in dir_items:
+    Yields:
+        FileInfo objects (both files and folders)
+    """
+    
+    # A recursive scan visits every subfolder that calculate_folder_size
+    # already walked for its parent, so reuse those sizes and directory
+    # listings instead of reading and stat-ing the subtree again at each
+    # level. Listings of skipped (hidden or ignored) folders are only
+    # released when the scan ends.
+    folder_sizes = {} if recursive else None
+    folder_listings = (listings if listings is not None else {}) if recursive else None
+    
+    def _scan_recursive(current_path: str) -> Iterator[FileInfo]:
+        """Internal recursive scanner with folder detection"""
+        entries = folder_listings.pop(current_path, None) if recursive else None
+        if entries is None:
+            try:
+                with os.scandir(current_path) as it:
+                    entries = list(it)
+            except (OSError, PermissionError):
+                # Skip folders we can't access
+                return
+        
+        for entry in entries:
             try:
                 # Skip hidden files and folders (starting with .)
-                if item.name.startswith('.'):
+                if entry.name.startswith('.'):
                     continue
                 
                 # Handle FOLDERS/DIRECTORIES
-                if item.is_dir():
-                    # Add folder to results (NEW BEHAVIOR)
-                    if collect_folders:
-                        try:
-                            stat = item.stat()
-                            folder_size, folder_items = _calculate_folder_size(item)
-                            
-                            items.append(FileInfo(
-                                path=item,
-                                size_bytes=folder_size,
-                                category="Folder",  # Special category for folders
-                                is_sensitive=False,
-                                modified_at=stat.st_mtime,
-                                is_folder=True,
-                                item_count=folder_items
-                            ))
-                        except (OSError, PermissionError):
-                            # If we can't read folder, still add it with 0 size
-                            items.append(FileInfo(
-                                path=item,
-                                size_bytes=0,
-                                category="Folder",
-                                is_sensitive=False,
-                                modified_at=0,
-                                is_folder=True,
-                                item_count=0
-                            ))
+                if entry.is_dir():
+                    if entry.name in ignored:
+                        continue
+                    
+                    try:
+                        stat = entry.stat()
+                        folder_size, folder_items = calculate_folder_size(
+                            entry.path, folder_sizes, folder_listings
+                        )
+                        
+                        yield FileInfo(
+                            path=Path(entry.path),
+                            size_bytes=folder_size,
+                            category="Folder",  # Special category for folders
+                            is_sensitive=False,
+                            modified_at=stat.st_mtime,
+                            is_folder=True,
+                            item_count=folder_items
+                        )
+                    except (OSError, PermissionError):
+                        # If we can't read folder, still add it with 0 size
+                        yield FileInfo(
+                            path=Path(entry.path),
+                            size_bytes=0,
+                            category="Folder",
+                            is_sensitive=False,
+                            modified_at=0,
+                            is_folder=True,
+                            item_count=0
+                        )
                     
                     # Recurse into subdirectories
                     if recursive:
-                        _scan_recursive(item, collect_folders=True)
+                        yield from _scan_recursive(entry.path)
                     
                     continue
                 
                 # Handle FILES (including symlinks to files)
-                if item.is_file() or item.is_symlink():
+                if entry.is_file() or entry.is_symlink():
                     try:
-                        stat = item.stat()
+                        stat = entry.stat()
+                        item = Path(entry.path)
                         
-                        items.append(FileInfo(
+                        yield FileInfo(
                             path=item,
                             size_bytes=stat.st_size,
                             category=categorize_file(item),
@@ -183,7 +267,7 @@ def scan_folder(folder: Path, recursive: bool = False) -> List[FileInfo]:
                             modified_at=stat.st_mtime,
                             is_folder=False,
                             item_count=0
-                        ))
+                        )
                     except (OSError, PermissionError):
                         # Skip files we can't read
                         continue
@@ -193,9 +277,174 @@ def scan_folder(folder: Path, recursive: bool = False) -> List[FileInfo]:
                 continue
     
     # Start scanning from root folder
-    _scan_recursive(folder, collect_folders=True)
+    yield from _scan_recursive(os.fspath(folder))
+
+def scan_folder(
+    folder: Path,
+    recursive: bool = False,
+    ignored: frozenset = frozenset(),
+) -> List[FileInfo]:
+    """
+    Advanced folder scanning - detects BOTH files AND folders/subfolders
     
-    return items
+    Features:
+    - Scans files AND folders at current level
+    - Recursive subdirectory scanning (when enabled)
+    - Automatic hidden file/folder detection
+    - Symlink handling
+    - Permission error handling
+    - Intelligent categorization
+    - Folder size calculation
+    
+    Args:
+        folder: Folder to scan
+        recursive: Scan all subdirectories recursively
+        ignored: Folder names to leave out entirely (e.g. IGNORED_DIRS)
+        
+    Returns:
+        List of FileInfo objects (both files and folders)
+    """
+    # The whole tree is read anyway when recursive, so read it concurrently
+    # first; the scan itself then makes no further directory or stat calls
+    listings = read_tree(folder, ignored) if recursive else None
+    return list(scan_folder_iter(folder, recursive, ignored, listings))
+
+def scan_and_group(
+    folder: Path,
+    key_fn: Callable[[os.DirEntry, os.stat_result], str],
+) -> Dict[str, List[os.DirEntry]]:
+    """
+    Scan one folder level and group its entries in the same pass
+    
+    Hidden entries are skipped, like scan_folder. No FileInfo objects or
+    intermediate list are built - each DirEntry goes straight into its group.
+    
+    Args:
+        folder: Folder to scan
+        key_fn: Maps (entry, stat) to a group name
+        
+    Returns:
+        Dict mapping group name to DirEntry objects
+    """
+    groups: Dict[str, List[os.DirEntry]] = {}
+    
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                # Skip hidden files and folders (starting with .)
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except (OSError, PermissionError):
+                    # Skip items we can't read (including broken symlinks)
+                    continue
+                groups.setdefault(key_fn(entry, stat), []).append(entry)
+    except (OSError, PermissionError):
+        pass
+    
+    return groups
+
+def parallel_walk(
+    root: Path,
+    visit: Callable[[str, list[os.DirEntry]], list[str]],
+    max_workers: int = WALK_WORKERS,
+) -> None:
+    """
+    Walk a directory tree, scanning sibling folders concurrently
+
+    visit(path, entries) runs once per readable folder, in a worker thread,
+    and returns the subfolders to descend into.
+    """
+    def _scan(path: str) -> list[str]:
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return []
+        return visit(path, entries)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_scan, os.fspath(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for subfolder in future.result():
+                    pending.add(pool.submit(_scan, subfolder))
+
+def read_tree(
+    root: Path,
+    ignored: frozenset = frozenset(),
+    max_workers: int = WALK_WORKERS,
+) -> Dict[str, List[os.DirEntry]]:
+    """
+    Read every folder below root concurrently, for calculate_folder_size
+    and scan_folder_iter to reuse
+
+    Each entry is stat-ed in the worker thread too, which fills the
+    DirEntry stat cache. Symlinked folders are not followed, so link
+    cycles can't trap the walk; callers read those folders themselves.
+    Hidden folders and folders named in ignored are skipped as well, like
+    scan_folder_iter does; calculate_folder_size reads any of them it
+    still needs on its own.
+
+    Args:
+        root: Folder to read
+        ignored: Folder names to leave out (e.g. IGNORED_DIRS)
+        max_workers: Threads reading folders concurrently
+
+    Returns:
+        Dict mapping folder path to its DirEntry list
+    """
+    listings: Dict[str, List[os.DirEntry]] = {}
+
+    def _visit(path: str, entries: list[os.DirEntry]) -> list[str]:
+        listings[path] = entries
+        subfolders = []
+        for entry in entries:
+            try:
+                entry.stat()
+                if (
+                    entry.is_dir(follow_symlinks=False)
+                    and not entry.name.startswith('.')
+                    and entry.name not in ignored
+                ):
+                    subfolders.append(entry.path)
+            except OSError:
+                continue
+        return subfolders
+
+    parallel_walk(root, _visit, max_workers)
+    return listings
+
+def scan_folder_cached(
+    folder: Path,
+    recursive: bool = False,
+    ignored: frozenset = frozenset(),
+) -> List[FileInfo]:
+    """
+    scan_folder with a short-lived cache
+    
+    Adding, removing or renaming an entry bumps the folder's mtime, so such
+    changes miss the cache. In-place edits to files (or anything below the
+    top level for recursive scans) are only picked up once the entry expires
+    or a mutating tool calls utils.cache.invalidate_path_caches.
+    The returned list is shared - callers must not mutate it.
+    
+    Args:
+        folder: Folder to scan
+        recursive: Scan all subdirectories recursively
+        ignored: Folder names to leave out entirely (e.g. IGNORED_DIRS)
+        
+    Returns:
+        List of FileInfo objects (both files and folders)
+    """
+    key = (os.fspath(folder), recursive, ignored, os.stat(folder).st_mtime_ns)
+    files = scan_cache.get(key)
+    if files is None:
+        files = scan_folder(folder, recursive, ignored)
+        scan_cache.set(key, files)
+    return files
 
 def group_by_category(files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
     """
@@ -210,26 +459,22 @@ def group_by_category(files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
     - Automatic size sorting (largest first)
     - Related category merging
     - Empty category filtering
-    - Statistical metadata
     
     Args:
         files: List of FileInfo objects
         
     Returns:
-        Dict mapping category name to sorted list of files with metadata
+        Dict mapping category name to files sorted by size
     """
-    groups = {}
+    groups: Dict[str, List[FileInfo]] = defaultdict(list)
     
     # Primary grouping by category
     for file_info in files:
-        cat = file_info.category
-        if cat not in groups:
-            groups[cat] = []
-        groups[cat].append(file_info)
+        groups[file_info.category].append(file_info)
     
     # Sort each category by size (largest first) for better organization
-    for category in groups:
-        groups[category].sort(key=lambda f: f.size_bytes, reverse=True)
+    for category_files in groups.values():
+        category_files.sort(key=lambda f: f.size_bytes, reverse=True)
     
     # Merge related categories for better organization
     if "Documentation" in groups and "Other" in groups:
@@ -244,58 +489,5 @@ def group_by_category(files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
         # Keep backup separate for easy cleanup
         pass
     
-    # Remove empty categories
-    groups = {k: v for k, v in groups.items() if v}
-    
-    # Add advanced grouping alternatives as metadata (for future use)
-    # This enables the same function to support multiple grouping strategies
-    
-    # Size-based groups
-    size_groups = {
-        "Tiny (< 100KB)": [f for f in files if f.size_mb < 0.1],
-        "Small (100KB - 1MB)": [f for f in files if 0.1 <= f.size_mb < 1],
-        "Medium (1MB - 10MB)": [f for f in files if 1 <= f.size_mb < 10],
-        "Large (10MB - 100MB)": [f for f in files if 10 <= f.size_mb < 100],
-        "Huge (> 100MB)": [f for f in files if f.size_mb >= 100]
-    }
-    size_groups = {k: v for k, v in size_groups.items() if v}
-    
-    # Date-based groups
-    now = datetime.now().timestamp()
-    date_groups = {
-        "Today": [f for f in files if (now - f.modified_at) < 86400],
-        "This Week": [f for f in files if 86400 <= (now - f.modified_at) < 604800],
-        "This Month": [f for f in files if 604800 <= (now - f.modified_at) < 2592000],
-        "Older": [f for f in files if (now - f.modified_at) >= 2592000]
-    }
-    date_groups = {k: v for k, v in date_groups.items() if v}
-    
-    # Extension-based groups (for fine-grained control)
-    ext_groups = {}
-    for file_info in files:
-        ext = file_info.path.suffix.lower() or "no_extension"
-        if ext not in ext_groups:
-            ext_groups[ext] = []
-        ext_groups[ext].append(file_info)
-    
-    # Duplicate detection (same name and size)
-    duplicates = {}
-    for file_info in files:
-        key = (file_info.path.name, file_info.size_bytes)
-        if key not in duplicates:
-            duplicates[key] = []
-        duplicates[key].append(file_info)
-    potential_duplicates = {k: v for k, v in duplicates.items() if len(v) > 1}
-    
-    # Attach metadata to groups for advanced usage
-    groups._metadata = {
-        'size_groups': size_groups,
-        'date_groups': date_groups,
-        'ext_groups': ext_groups,
-        'duplicates': potential_duplicates,
-        'total_files': len(files),
-        'total_size': sum(f.size_bytes for f in files),
-        'categories_count': len(groups)
-    }
-    
-    return groups
\ No newline at end of file
+    # Only categories that received a file exist, so none are empty
+    return dict(groups)